@@ -1,11 +1,13 @@
 from crewai import Agent, LLM
 from config.settings import AGENT_CONFIG, GROQ_MODEL, GROQ_API_KEY
 from tools import EmotionAnalyzer, CharacterTraitExtractor
+from functools import lru_cache
 import os
 
 
+@lru_cache(maxsize=1)
 def get_llm():
-    """Get the configured LLM - Using Groq only"""
+    """Get the configured LLM - Using Groq only (shared across all agents)"""
     # Set GROQ_API_KEY environment variable
     if GROQ_API_KEY:
         os.environ["GROQ_API_KEY"] = GROQ_API_KEY
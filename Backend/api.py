@@ -1,16 +1,38 @@
 import os
 import json
+import asyncio
+import hashlib
+import logging
+import redis
+from contextlib import asynccontextmanager, suppress
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
-from neo4j import GraphDatabase
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError, field_validator
+from typing import Dict, List, Literal, Optional
+from neo4j import AsyncGraphDatabase
 from llm_judge import evaluate_violation, extract_entities
+from app.db.redis_client import get_redis
 
 load_dotenv()
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open and warm the Neo4j pool before the first request arrives."""
+    engine = ValidationEngine()
+    await engine.driver.verify_connectivity()
+    await engine.ensure_schema()
+    engine.lookups.start()
+    app.state.engine = engine
+    yield
+    await engine.close()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,93 +44,304 @@ app.add_middleware(
 
 URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 AUTH = (os.getenv("NEO4J_USER", "neo4j"), os.getenv("NEO4J_PASSWORD", "password123"))
+# Naming the database up front skips the driver's home-database lookup
+DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+
+# Verdict cache: identical judge inputs replay the stored verdict
+VERDICT_CACHE_TTL = 7 * 24 * 3600
+MIN_CACHEABLE_CONFIDENCE = 0.7
+
+
+class Verdict(BaseModel):
+    """Schema the LLM judge's JSON reply must satisfy."""
+    verdict: Literal["INTENTIONAL", "UNINTENTIONAL"]
+    detailed_analysis: str
+    fix_suggestion: str
+    confidence: float
+
+    @field_validator("verdict", mode="before")
+    @classmethod
+    def _normalize_verdict(cls, value):
+        return value.strip().upper() if isinstance(value, str) else value
+
+
+def cached_evaluate_violation(violation_type, violation_msg, scene_text, db_context):
+    """
+    evaluate_violation behind an exact-match Redis cache.
+    Only confident verdicts are stored so a shaky answer is never replayed.
+    """
+    payload = json.dumps({
+        "vtype": violation_type,
+        "vmsg": violation_msg,
+        "scene_text": scene_text,
+        "db_context": db_context,
+    }, sort_keys=True)
+    key = "verdict:" + hashlib.sha256(payload.encode()).hexdigest()
+
+    try:
+        cached = get_redis().get(key)
+        if cached is not None:
+            return cached
+    except redis.RedisError as e:
+        logger.warning("⚠️ Verdict cache unavailable: %s", e)
+
+    llm_response = evaluate_violation(
+        violation_type=violation_type,
+        violation_msg=violation_msg,
+        scene_text=scene_text,
+        db_context=db_context
+    )
+
+    try:
+        confidence = Verdict.model_validate_json(llm_response).confidence
+    except ValidationError:
+        return llm_response
+
+    if confidence >= MIN_CACHEABLE_CONFIDENCE:
+        try:
+            get_redis().setex(key, VERDICT_CACHE_TTL, llm_response)
+        except redis.RedisError:
+            pass
+
+    return llm_response
+
 
 class ChapterInput(BaseModel):
     chapter_id: int
     text_snippet: str 
 
+class CharacterLookupBatcher:
+    """
+    Coalesces character lookups from concurrent /validate requests.
+
+    Each request enqueues its names and awaits a future; a single worker
+    drains up to batch_limit requests (or waits max_wait seconds) and
+    resolves all of them with one UNWIND read transaction.
+    """
+
+    def __init__(self, driver, batch_limit: int = 50, max_wait: float = 0.01,
+                 lookup_timeout: float = 15.0):
+        self.driver = driver
+        self.batch_limit = batch_limit
+        self.max_wait = max_wait
+        self.lookup_timeout = lookup_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+
+    async def lookup(self, names: List[str]) -> Dict[str, dict]:
+        """Return {lowercased name: {name, status}} for names found in the graph."""
+        if self._worker is not None and self._worker.done():
+            if not self._worker.cancelled() and self._worker.exception():
+                logger.error("❌ Character lookup worker died: %s", self._worker.exception())
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((names, future))
+        return await asyncio.wait_for(future, self.lookup_timeout)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            # Poll with get_nowait: cancelling a pending get() can drop an item
+            while len(batch) < self.batch_limit:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, self.max_wait / 5))
+
+            try:
+                results = await self._fetch([names for names, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for idx, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result(results.get(idx, {}))
+
+    async def _fetch(self, name_lists: List[List[str]]) -> Dict[int, Dict[str, dict]]:
+        rows = [
+            {"id": idx, "names": [n.lower() for n in names]}
+            for idx, names in enumerate(name_lists)
+        ]
+        async with self.driver.session(database=DATABASE) as session:
+            records = await session.execute_read(self._lookup_characters, rows)
+
+        return {
+            record["id"]: {c["queried"]: c for c in record["characters"]}
+            for record in records
+        }
+
+    @staticmethod
+    async def _lookup_characters(tx, rows: List[dict]) -> List[dict]:
+        """Resolve every request's names in a single UNWIND round-trip."""
+        result = await tx.run("""
+            UNWIND $batch AS row
+            UNWIND row.names AS n
+            MATCH (c:Character)
+            WHERE c.name_lower = n
+            RETURN row.id AS id,
+                   collect({queried: n, name: c.name, status: c.status}) AS characters
+            """, batch=rows)
+        return await result.data()
+
+
 class ValidationEngine:
     def __init__(self):
-        self.driver = GraphDatabase.driver(URI, auth=AUTH)
-
-    def close(self):
-        self.driver.close()
-
-    def validate_chapter(self, data: ChapterInput):
-        alerts = []
-        
-        print(f"\n--- NEW ANALYSIS FOR CHAPTER {data.chapter_id} ---")
-        extracted_chars = extract_entities(data.text_snippet)
-        print(f"📝 Extracted: {extracted_chars}")
-
-        with self.driver.session() as session:
-            for char in extracted_chars:
-                name = char.get("name")
-                status_in_text = char.get("status")
-
-                if status_in_text == "alive":
-                    # QUERY: Look for the character (Dead OR Alive)
-                    result = session.run("""
-                        MATCH (c:Character) 
-                        WHERE toLower(c.name) = toLower($name) 
-                        RETURN c.name, c.status
-                        """, name=name).single()
-                    
-                    # CASE 1: CHARACTER DOES NOT EXIST (The fix you asked for)
-                    if not result:
-                        print(f"⚠️ Unknown Character: {name}")
-                        alerts.append({
-                            "type": "Unknown Character",
-                            "message": f"'{name}' appears in the text but is not in the database.",
-                            "suggestion": f"Is this a new character? If so, please add them. If it's a typo of an existing character, please fix it.",
-                            "ai_confidence": 1.0
-                        })
-                    
-                    # CASE 2: CHARACTER EXISTS BUT IS DEAD
-                    elif result['c.status'] == 'dead':
-                        print(f"🚨 RESURRECTION DETECTED: {result['c.name']}")
-                        
-                        # Consult AI Judge
-                        llm_response = evaluate_violation(
-                            violation_type="Resurrection Error",
-                            violation_msg=f"Database says {result['c.name']} is dead.",
-                            scene_text=data.text_snippet,
-                            db_context=f"{result['c.name']} died previously."
-                        )
-                        
-                        try:
-                            verdict = json.loads(llm_response)
-                            verdict_text = verdict.get("verdict", "").upper()
-                            is_intentional = verdict_text == "INTENTIONAL"
-                            alert_type = "Narrative Device" if is_intentional else "Critical Error"
-                            
-                            alerts.append({
-                                "type": alert_type,
-                                "message": verdict.get("detailed_analysis"),
-                                "suggestion": verdict.get("fix_suggestion"),
-                                "ai_confidence": verdict.get("confidence", 0)
-                            })
-                        except:
-                            alerts.append({
-                                "type": "Critical Error", 
-                                "message": f"{name} is dead in DB.", 
-                                "ai_confidence": 1.0
-                            })
-                    
-                    # CASE 3: CHARACTER EXISTS AND IS ALIVE (Valid)
-                    else:
-                        print(f"✅ Verified: {result['c.name']} is known and alive.")
-
-        return alerts
-
-engine = ValidationEngine()
+        self.driver = AsyncGraphDatabase.driver(
+            URI,
+            auth=AUTH,
+            max_connection_pool_size=100,
+            connection_acquisition_timeout=5,
+        )
+        self.lookups = CharacterLookupBatcher(self.driver)
+
+    async def ensure_schema(self):
+        """
+        Index the lowercased character name so lookups are index seeks.
+        Neo4j cannot index toLower(c.name), so the graph writers keep the
+        normalized value in c.name_lower; this backfills nodes written
+        before they did.
+        """
+        async with self.driver.session(database=DATABASE) as session:
+            result = await session.run(
+                "CREATE INDEX character_name_lower IF NOT EXISTS "
+                "FOR (c:Character) ON (c.name_lower)"
+            )
+            await result.consume()
+            result = await session.run("""
+                MATCH (c:Character)
+                WHERE c.name_lower IS NULL AND c.name IS NOT NULL
+                SET c.name_lower = toLower(c.name)
+                """)
+            await result.consume()
+
+    async def close(self):
+        await self.lookups.stop()
+        await self.driver.close()
+
+    async def _warm_connection(self):
+        """Open a pooled Bolt socket while entity extraction is in flight."""
+        async with self.driver.session(database=DATABASE) as session:
+            result = await session.run("RETURN 1")
+            await result.consume()
+
+    async def _judge_resurrection(self, name: str, character: dict, scene_text: str) -> dict:
+        """Ask the LLM judge whether a dead character's return is intentional."""
+        violation_msg = f"Database says {character['name']} is dead."
+        verdict = None
+
+        # A malformed reply gets one retry with an explicit format reminder
+        for attempt in range(2):
+            # Consult AI Judge (blocking SDK call, kept off the event loop)
+            llm_response = await asyncio.to_thread(
+                cached_evaluate_violation,
+                violation_type="Resurrection Error",
+                violation_msg=violation_msg,
+                scene_text=scene_text,
+                db_context=f"{character['name']} died previously."
+            )
+            try:
+                verdict = Verdict.model_validate_json(llm_response)
+                break
+            except ValidationError as e:
+                logger.warning("⚠️ Invalid verdict for %s (attempt %d): %s", name, attempt + 1, e)
+                violation_msg += " Return valid JSON only, matching the requested schema."
+
+        if verdict is None:
+            return {
+                "type": "Critical Error",
+                "message": f"{name} is dead in DB.",
+                "ai_confidence": 1.0
+            }
+
+        is_intentional = verdict.verdict == "INTENTIONAL"
+        alert_type = "Narrative Device" if is_intentional else "Critical Error"
+
+        return {
+            "type": alert_type,
+            "message": verdict.detailed_analysis,
+            "suggestion": verdict.fix_suggestion,
+            "ai_confidence": verdict.confidence
+        }
+
+    async def validate_chapter(self, data: ChapterInput):
+        logger.debug("--- NEW ANALYSIS FOR CHAPTER %s ---", data.chapter_id)
+        extracted_chars, _ = await asyncio.gather(
+            asyncio.to_thread(extract_entities, data.text_snippet),
+            self._warm_connection(),
+        )
+        logger.debug("📝 Extracted: %s", extracted_chars)
+
+        # extract_entities returns plain names; status comes from the graph
+        names = list(extracted_chars)
+        if not names:
+            return []
+
+        found = await self.lookups.lookup(names)
+
+        # None marks a slot filled by a pending judgment, keeping alert order
+        slots = []
+        judgments = []
+
+        for name in names:
+            result = found.get(name.lower())
+
+            # CASE 1: CHARACTER DOES NOT EXIST (The fix you asked for)
+            if not result:
+                slots.append({
+                    "type": "Unknown Character",
+                    "message": f"'{name}' appears in the text but is not in the database.",
+                    "suggestion": f"Is this a new character? If so, please add them. If it's a typo of an existing character, please fix it.",
+                    "ai_confidence": 1.0
+                })
+
+            # CASE 2: CHARACTER EXISTS BUT IS DEAD
+            elif result['status'] == 'dead':
+                slots.append(None)
+                judgments.append(
+                    self._judge_resurrection(name, result, data.text_snippet)
+                )
+
+            # CASE 3: CHARACTER EXISTS AND IS ALIVE (Valid): nothing to report
+
+        if logger.isEnabledFor(logging.DEBUG):
+            unknown = sum(1 for alert in slots if alert is not None)
+            logger.debug(
+                "validation summary: unknown=%d dead=%d alive=%d",
+                unknown, len(judgments), len(names) - unknown - len(judgments),
+            )
+
+        # All LLM judgments for this chapter run concurrently
+        verdicts = iter(await asyncio.gather(*judgments))
+        return [alert if alert is not None else next(verdicts) for alert in slots]
 
 @app.post("/validate")
-async def validate_chapter(chapter: ChapterInput):
+async def validate_chapter(chapter: ChapterInput, request: Request):
     try:
-        alerts = engine.validate_chapter(chapter)
+        alerts = await request.app.state.engine.validate_chapter(chapter)
         status = "violation" if alerts else "valid"
         return {"status": status, "alerts": alerts}
     except Exception as e:
-        print(f"❌ Fatal Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        logger.error("❌ Fatal Error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
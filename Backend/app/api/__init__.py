@@ -1,11 +1,18 @@
 """
 API package initialization
+
+Routers are resolved lazily (PEP 562) so importing a single submodule such
+as app.api.auth or app.api.routing doesn't pull in every router and the
+services behind them.
 """
 
-from .creative_assistant import router as creative_assistant_router
-from .grammar import router as grammar_router
-from .autocomplete import router as autocomplete_router
-from .nlp import router as nlp_router
-from .graph import router as graph_router
+import importlib
 
 __all__ = ["creative_assistant_router", "grammar_router", "autocomplete_router", "nlp_router", "graph_router"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f".{name[:-len('_router')]}", __package__)
+        return module.router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
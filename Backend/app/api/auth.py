@@ -3,14 +3,19 @@ Authentication routes for user login/signup
 """
 from fastapi import APIRouter, HTTPException, Depends, Header
 from fastapi.responses import JSONResponse
+import asyncio
+import hashlib
 import logging
-import uuid
+import secrets
+
+import redis
 from typing import Optional
+from cachetools import TTLCache
 from pydantic import BaseModel
 
 from app.models.user import UserCreate, UserLogin, UserResponse, LoginResponse
 from app.db.user_db import MongoUserDB
-from app.config import settings
+from app.db.redis_client import get_async_redis
 
 logger = logging.getLogger(__name__)
 
@@ -29,37 +34,75 @@ def get_user_db():
     global user_db
     if user_db is None:
         try:
-            user_db = MongoUserDB(settings.mongodb_url, settings.mongodb_db_name)
+            user_db = MongoUserDB()
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise HTTPException(status_code=503, detail="Database unavailable")
     return user_db
 
-# In-memory session storage (for hackathon - simple session management)
-# In production, use Redis or JWT
-active_sessions = {}  # {session_token: user_id}
+# Sessions live in Redis so they survive restarts and are shared by all
+# workers. Each session is a hash holding the public user fields, so
+# validating a token never touches MongoDB. A small per-process TTL cache
+# absorbs repeat lookups of the same token; a revoked token may linger
+# there for up to L1_SESSION_TTL_SECONDS. Both stores are keyed by a token
+# digest, so bearer tokens are never held in process memory or persisted.
+# Redis is the only session store, so its errors surface as a 503.
+SESSION_TTL_SECONDS = 86400
+L1_SESSION_TTL_SECONDS = 30
+
+_session_cache = TTLCache(maxsize=10_000, ttl=L1_SESSION_TTL_SECONDS)  # {session key: user}
+
+
+def _session_key(session_token: str) -> str:
+    return "sess:" + hashlib.sha256(session_token.encode()).hexdigest()
 
 
-def create_session(user_id: str) -> str:
+def _session_store_unavailable(e: redis.RedisError) -> HTTPException:
+    logger.error(f"Session store unavailable: {e}")
+    return HTTPException(status_code=503, detail="Session store unavailable")
+
+
+async def create_session(user: dict) -> str:
     """Create a session token for user."""
-    session_token = str(uuid.uuid4())
-    active_sessions[session_token] = user_id
+    session_token = secrets.token_urlsafe(24)
+    session = {"id": user["id"], "email": user["email"], "name": user["name"]}
+
+    key = _session_key(session_token)
+    async with get_async_redis().pipeline(transaction=True) as pipe:
+        pipe.hset(key, mapping=session)
+        pipe.expire(key, SESSION_TTL_SECONDS)
+        await pipe.execute()
+
+    _session_cache[key] = session
     return session_token
 
 
-def get_user_from_session(session_token: str, db: MongoUserDB) -> dict:
+async def get_session_user(session_token: str) -> Optional[dict]:
+    """Resolve a session token to the public user fields, or None if unknown/expired."""
+    key = _session_key(session_token)
+    user = _session_cache.get(key)
+    if user is None:
+        user = await get_async_redis().hgetall(key) or None
+        if user is not None:
+            _session_cache[key] = user
+    return user
+
+
+async def delete_session(session_token: str) -> bool:
+    """Remove a session. Returns True if it existed."""
+    key = _session_key(session_token)
+    _session_cache.pop(key, None)
+    return bool(await get_async_redis().delete(key))
+
+
+async def get_user_from_session(session_token: str) -> dict:
     """Get user from session token."""
-    if session_token not in active_sessions:
+    try:
+        user = await get_session_user(session_token)
+    except redis.RedisError as e:
+        raise _session_store_unavailable(e)
+    if user is None:
         raise HTTPException(status_code=401, detail="Invalid or expired session")
-    
-    user_id = active_sessions[session_token]
-    user = db.get_user_by_id(user_id)
-    
-    if not user:
-        # Session exists but user doesn't - cleanup
-        del active_sessions[session_token]
-        raise HTTPException(status_code=401, detail="User not found")
-    
     return user
 
 
@@ -70,19 +113,23 @@ async def signup(user_data: UserCreate):
         db = get_user_db()
         
         # Check if user already exists
-        existing_user = db.get_user_by_email(user_data.email)
+        existing_user = await db.get_user_by_email(user_data.email)
         if existing_user:
             raise HTTPException(status_code=400, detail="Email already registered")
         
         # Create new user
-        new_user = db.create_user(
+        new_user = await db.create_user(
             email=user_data.email,
             name=user_data.name,
             password=user_data.password
         )
         
-        # Create session
-        session_token = create_session(new_user["id"])
+        # Create session; without one the account is unusable, so roll it back
+        try:
+            session_token = await create_session(new_user)
+        except redis.RedisError as e:
+            await db.delete_user(new_user["id"])
+            raise _session_store_unavailable(e)
         
         logger.info(f"✅ New user registered: {user_data.email}")
         
@@ -113,17 +160,28 @@ async def login(login_data: UserLogin):
         db = get_user_db()
         
         # Get user by email
-        user = db.get_user_by_email(login_data.email)
+        user = await db.get_user_by_email(login_data.email)
         
         if not user:
             raise HTTPException(status_code=401, detail="Invalid email or password")
         
         # Verify password
-        if not db.verify_password(user["password"], login_data.password):
+        if not await asyncio.to_thread(db.verify_password, user["password"], login_data.password):
             raise HTTPException(status_code=401, detail="Invalid email or password")
         
+        # Migrate legacy plaintext passwords to bcrypt on successful login
+        if db.needs_rehash(user["password"]):
+            try:
+                await db.set_password(user["id"], login_data.password)
+                logger.info(f"🔐 Password hash upgraded for: {login_data.email}")
+            except Exception as e:
+                logger.warning(f"Password hash upgrade failed for {login_data.email}: {e}")
+        
         # Create session
-        session_token = create_session(user["id"])
+        try:
+            session_token = await create_session(user)
+        except redis.RedisError as e:
+            raise _session_store_unavailable(e)
         
         logger.info(f"✅ User logged in: {login_data.email}")
         
@@ -152,8 +210,7 @@ async def get_me(session_token: str = None):
         raise HTTPException(status_code=401, detail="No session token provided")
     
     try:
-        db = get_user_db()
-        user = get_user_from_session(session_token, db)
+        user = await get_user_from_session(session_token)
         return UserResponse(
             id=user["id"],
             email=user["email"],
@@ -180,8 +237,12 @@ async def logout(request: LogoutRequest, authorization: Optional[str] = Header(N
     if not session_token:
         raise HTTPException(status_code=400, detail="No session token provided")
     
-    if session_token in active_sessions:
-        del active_sessions[session_token]
+    try:
+        deleted = await delete_session(session_token)
+    except redis.RedisError as e:
+        raise _session_store_unavailable(e)
+    
+    if deleted:
         logger.info("✅ User logged out")
         return {"success": True, "message": "Logged out successfully"}
     else:
@@ -194,19 +255,17 @@ async def check_session(session_token: str = None):
     if not session_token:
         return {"valid": False, "message": "No session token"}
     
-    if session_token in active_sessions:
-        try:
-            db = get_user_db()
-            user = get_user_from_session(session_token, db)
-            return {
-                "valid": True,
-                "user": {
-                    "id": user["id"],
-                    "email": user["email"],
-                    "name": user["name"]
-                }
+    try:
+        user = await get_session_user(session_token)
+        if user is None:
+            return {"valid": False, "message": "Session not found"}
+        return {
+            "valid": True,
+            "user": {
+                "id": user["id"],
+                "email": user["email"],
+                "name": user["name"]
             }
-        except:
-            return {"valid": False, "message": "Session invalid"}
-    
-    return {"valid": False, "message": "Session not found"}
+        }
+    except:
+        return {"valid": False, "message": "Session invalid"}
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from app.api.schemas.autocomplete import AutocompleteRequest, AutocompleteResponse
 from app.services.autocomplete_service import autocomplete_service
+from app.api.routing import ORJSONRoute
 
-router = APIRouter(prefix="/api/v1/autocomplete", tags=["Autocomplete"])
+router = APIRouter(prefix="/api/v1/autocomplete", tags=["Autocomplete"], route_class=ORJSONRoute)
 
 @router.post("/predict", response_model=AutocompleteResponse)
 async def predict(request: AutocompleteRequest):
@@ -3,32 +3,183 @@ API routes for Creative AI Assistant
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import asyncio
+import hashlib
 import logging
 import io
+import threading
+from functools import cache
+
+import orjson
+from cachetools import TTLCache
+from openai import AsyncOpenAI
 
 from app.services.creative_assistant import AgenticReasoningEngine
+from app.services.creative_assistant.flow_engine import FlowEngine, close_clients as close_flow_clients
+from app.services.creative_assistant.plot_risk_analyzer import PlotRiskAnalyzer
+from app.services.creative_assistant.utils.http_client import get_http_client, close_http_client
+from app.api.routing import ORJSONRoute
+from app.config import settings
+
+# Optional document parsers for /upload-file
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+try:
+    import docx
+except ImportError:
+    docx = None
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/creative-assistant", tags=["Creative AI Assistant"])
+router = APIRouter(
+    prefix="/api/v1/creative-assistant",
+    tags=["Creative AI Assistant"],
+    route_class=ORJSONRoute,
+    default_response_class=ORJSONResponse,
+)
+
+# Enterprise system prompt for professional document rewriting
+REWRITE_SYSTEM_PROMPT = """You are a Senior Full-Stack Document Rewrite Engine with 30+ years of production experience.
+
+PRIMARY OBJECTIVE: Rewrite and improve documents while:
+- Preserving original meaning exactly
+- Improving clarity, grammar, flow, and structure
+- Maintaining formatting and section hierarchy
+- Avoiding hallucinations or content loss
+
+DOCUMENT PROCESSING STRATEGY:
+1. Parse: Identify headings, sections, lists, paragraphs
+2. Understand: Determine intent, track terminology
+3. Rewrite: Improve readability while preserving semantics 100%
+4. Maintain Continuity: Keep consistent terminology
+
+REWRITING RULES (STRICT):
+- Do NOT summarize unless asked
+- Do NOT skip content
+- Do NOT hallucinate missing sections
+- Do NOT change technical meaning
+- Do NOT add explanations
+
+OUTPUT REQUIREMENTS:
+- Output ONLY the rewritten content
+- No commentary or explanations
+- Clean formatting
+- High editorial quality
+
+QUALITY BAR: Senior human editor standard, publish-ready quality."""
+
+# Style-specific instructions
+REWRITE_STYLE_INSTRUCTIONS = {
+    "professional": "Rewrite in professional, polished style. Maintain clarity and precision.",
+    "creative": "Rewrite with creative flair and vivid imagery while preserving all facts.",
+    "concise": "Rewrite more concisely while keeping all key information.",
+    "dramatic": "Rewrite with dramatic tension and emotional impact while staying factual.",
+    "academic": "Rewrite in formal academic style with precise language.",
+    "business": "Rewrite in concise executive-friendly business style.",
+    "simplified": "Rewrite in plain language for easy understanding."
+}
 
-# Initialize reasoning engine (singleton)
-reasoning_engine = AgenticReasoningEngine()
+
+# Identical rewrite/flow requests (writers retrying the same paragraph)
+# replay the previous LLM result for an hour
+_generation_cache = TTLCache(maxsize=1024, ttl=3600)
+_generation_cache_lock = asyncio.Lock()
+
+
+def _generation_cache_key(endpoint: str, *options: Any, content: str) -> tuple:
+    digest = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+    return (endpoint, *options, digest)
+
+
+async def _get_cached_generation(key: tuple) -> Optional[Any]:
+    async with _generation_cache_lock:
+        return _generation_cache.get(key)
+
+
+async def _set_cached_generation(key: tuple, value: Any):
+    async with _generation_cache_lock:
+        _generation_cache[key] = value
+
+
+@cache
+def get_rewrite_client() -> Tuple[AsyncOpenAI, str]:
+    """
+    Shared async client and model for /rewrite, resolved once from the
+    configured key so the HTTP pool is reused across requests.
+    """
+    api_key = settings.xai_api_key
+    if api_key.startswith("gsk_"):
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url="https://api.groq.com/openai/v1",
+            http_client=get_http_client()
+        )
+        return client, "llama-3.3-70b-versatile"
+    client = AsyncOpenAI(api_key=api_key, base_url="https://api.x.ai/v1", http_client=get_http_client())
+    return client, settings.grok_model
+
+
+@cache
+def get_reasoning_engine() -> AgenticReasoningEngine:
+    """Build the reasoning engine on first use rather than at import time."""
+    return AgenticReasoningEngine()
+
+
+@cache
+def get_flow_engine() -> FlowEngine:
+    """Shared FlowEngine, built on first use."""
+    return FlowEngine()
+
+
+@cache
+def get_plot_analyzer() -> PlotRiskAnalyzer:
+    """Shared PlotRiskAnalyzer, built on first use."""
+    return PlotRiskAnalyzer()
+
+
+async def init_services():
+    """
+    Build the shared engines ahead of the first request.
+    Called from the app lifespan; the constructors are blocking, so they
+    run concurrently in worker threads.
+    """
+    await asyncio.gather(
+        asyncio.to_thread(get_reasoning_engine),
+        asyncio.to_thread(get_flow_engine),
+        asyncio.to_thread(get_plot_analyzer),
+    )
+
+
+async def close_services():
+    """Close the shared LLM HTTP pool used by every engine's client."""
+    await close_flow_clients()
+    await close_http_client()
 
 
 # Request/Response Models
 class StoryAnalysisRequest(BaseModel):
     """Request model for story analysis."""
     story_id: str
-    nlp_data: Dict[str, Any] = Field(default_factory=dict)
-    knowledge_graph_data: Dict[str, Any] = Field(default_factory=dict)
-    continuity_data: Dict[str, Any] = Field(default_factory=dict)
-    writer_prefs_data: Dict[str, Any] = Field(default_factory=dict)
+    # Free-form JSON blobs passed straight to the reasoning engine; typed as
+    # Any so Pydantic doesn't walk every key on each request.
+    nlp_data: Any = Field(default_factory=dict)
+    knowledge_graph_data: Any = Field(default_factory=dict)
+    continuity_data: Any = Field(default_factory=dict)
+    writer_prefs_data: Any = Field(default_factory=dict)
     recent_scenes: List[Dict[str, Any]] = Field(default_factory=list)
     trigger_event: str = "manual_request"
-    trigger_metadata: Optional[Dict[str, Any]] = None
+    trigger_metadata: Optional[Any] = None
 
 
 class InterventionResponse(BaseModel):
@@ -57,7 +208,7 @@ class AnalysisResponse(BaseModel):
     why_not_others: str
     created_at: str
     # Predictive Risk Analysis (NEW)
-    predictive_risks: Optional[Dict[str, Any]] = None
+    predictive_risks: Optional[Any] = None
     risk_summary: Optional[str] = None
     primary_risk: Optional[str] = None
 
@@ -106,7 +257,7 @@ async def analyze_story(request: StoryAnalysisRequest):
         logger.info(f"Analyzing story: {request.story_id}")
         
         # Run reasoning cycle
-        plan = await reasoning_engine.run_reasoning_cycle(
+        plan = await get_reasoning_engine().run_reasoning_cycle(
             story_id=request.story_id,
             nlp_data=request.nlp_data,
             knowledge_graph_data=request.knowledge_graph_data,
@@ -117,9 +268,12 @@ async def analyze_story(request: StoryAnalysisRequest):
             trigger_metadata=request.trigger_metadata or {}
         )
         
-        # Convert to response format
+        # Convert to response format. The plan is built server-side, so
+        # model_construct skips re-running validators on trusted data.
+        construct = InterventionResponse.model_construct
+        planned = plan.planned_interventions
         interventions = [
-            InterventionResponse(
+            construct(
                 intervention_type=i.intervention_type.value,
                 priority=i.priority.value,
                 confidence=i.confidence,
@@ -132,10 +286,10 @@ async def analyze_story(request: StoryAnalysisRequest):
                 related_characters=i.related_characters,
                 related_themes=i.related_themes
             )
-            for i in plan.planned_interventions
+            for i in planned
         ]
         
-        return AnalysisResponse(
+        return AnalysisResponse.model_construct(
             story_id=plan.story_id,
             overall_story_health=plan.overall_story_health,
             plan_confidence=plan.plan_confidence,
@@ -163,7 +317,7 @@ async def submit_feedback(request: FeedbackRequest, background_tasks: Background
         
         # Process feedback in background
         background_tasks.add_task(
-            reasoning_engine.process_feedback,
+            get_reasoning_engine().process_feedback,
             story_id=request.story_id,
             intervention_id=request.intervention_id,
             feedback={
@@ -186,6 +340,7 @@ async def submit_feedback(request: FeedbackRequest, background_tasks: Background
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
+    reasoning_engine = get_reasoning_engine()
     return {
         "status": "healthy",
         "service": "creative_ai_assistant",
@@ -203,7 +358,6 @@ async def quick_analyze(request: QuickAnalyzeRequest):
     NOW ENHANCED: Auto-fetches NLP extraction and Knowledge Graph context.
     """
     try:
-        from app.services.creative_assistant.plot_risk_analyzer import PlotRiskAnalyzer
         from app.services.nlp import EntityExtractor
         from app.services.knowledge_graph import graph_db
         
@@ -279,17 +433,9 @@ async def quick_analyze(request: QuickAnalyzeRequest):
             logger.warning(f"NLP/KG extraction failed (non-critical): {e}")
             # Continue with empty data - analysis will still work
         
-        # Run predictive plot risk analysis
-        plot_analyzer = PlotRiskAnalyzer()
-        risk_analysis = await plot_analyzer.analyze_plot_risks(
-            content=request.recent_scene_summary,
-            story_title=request.story_title,
-            genre=request.genre,
-            completion_percentage=request.completion_percentage
-        )
-        
-        # Create enhanced mock data for standard analysis
-        analysis_request = StoryAnalysisRequest(
+        # Create enhanced mock data for standard analysis (server-built, so
+        # model_construct skips validation)
+        analysis_request = StoryAnalysisRequest.model_construct(
             story_id=f"story_{request.story_title.lower().replace(' ', '_')}",
             nlp_data=nlp_data,  # Now includes real NLP data
             knowledge_graph_data={
@@ -308,11 +454,24 @@ async def quick_analyze(request: QuickAnalyzeRequest):
                 "id": "scene_latest",
                 "title": "Recent Scene",
                 "summary": request.recent_scene_summary
-            }]
+            }],
+            continuity_data={},
+            writer_prefs_data={},
+            trigger_event="manual_request",
+            trigger_metadata=None
         )
         
-        # Run standard analysis
-        standard_analysis = await analyze_story(analysis_request)
+        # Predictive plot risk analysis and standard analysis are independent,
+        # so both LLM round-trips run concurrently
+        risk_analysis, standard_analysis = await asyncio.gather(
+            get_plot_analyzer().analyze_plot_risks(
+                content=request.recent_scene_summary,
+                story_title=request.story_title,
+                genre=request.genre,
+                completion_percentage=request.completion_percentage
+            ),
+            analyze_story(analysis_request)
+        )
         
         # Enhance response with predictive risks AND NLP/KG insights
         standard_analysis.predictive_risks = risk_analysis
@@ -329,86 +488,77 @@ async def quick_analyze(request: QuickAnalyzeRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/rewrite")
-async def rewrite_content(request: RewriteRequest):
-    """
-    Advanced document rewriting with production-grade quality.
-    Uses enterprise system prompt for professional editing.
-    """
-    try:
-        from openai import OpenAI
-        from app.config import settings
-        
-        # Determine API provider
-        api_key = settings.xai_api_key
-        if api_key.startswith("gsk_"):
-            client = OpenAI(api_key=api_key, base_url="https://api.groq.com/openai/v1")
-            model = "llama-3.3-70b-versatile"
-        else:
-            client = OpenAI(api_key=api_key, base_url="https://api.x.ai/v1")
-            model = settings.grok_model
-        
-        # Enterprise system prompt for professional document rewriting
-        system_prompt = """You are a Senior Full-Stack Document Rewrite Engine with 30+ years of production experience.
+def _build_rewrite_messages(request: RewriteRequest) -> List[Dict[str, str]]:
+    """Chat messages for a rewrite request."""
+    instruction = REWRITE_STYLE_INSTRUCTIONS.get(request.style, REWRITE_STYLE_INSTRUCTIONS["professional"])
+    
+    user_prompt = f"""{instruction}
 
-PRIMARY OBJECTIVE: Rewrite and improve documents while:
-- Preserving original meaning exactly
-- Improving clarity, grammar, flow, and structure
-- Maintaining formatting and section hierarchy
-- Avoiding hallucinations or content loss
+Original text:
+{request.content}
 
-DOCUMENT PROCESSING STRATEGY:
-1. Parse: Identify headings, sections, lists, paragraphs
-2. Understand: Determine intent, track terminology
-3. Rewrite: Improve readability while preserving semantics 100%
-4. Maintain Continuity: Keep consistent terminology
+Rewritten text:"""
+    
+    return [
+        {"role": "system", "content": REWRITE_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
 
-REWRITING RULES (STRICT):
-- Do NOT summarize unless asked
-- Do NOT skip content
-- Do NOT hallucinate missing sections
-- Do NOT change technical meaning
-- Do NOT add explanations
 
-OUTPUT REQUIREMENTS:
-- Output ONLY the rewritten content
-- No commentary or explanations
-- Clean formatting
-- High editorial quality
+def _sse_event(data: str, event: Optional[str] = None) -> bytes:
+    """Encode one Server-Sent Event whose data is a JSON string."""
+    prefix = f"event: {event}\n" if event else ""
+    return prefix.encode() + b"data: " + orjson.dumps(data) + b"\n\n"
 
-QUALITY BAR: Senior human editor standard, publish-ready quality."""
-        
-        # Style-specific instructions
-        style_instructions = {
-            "professional": "Rewrite in professional, polished style. Maintain clarity and precision.",
-            "creative": "Rewrite with creative flair and vivid imagery while preserving all facts.",
-            "concise": "Rewrite more concisely while keeping all key information.",
-            "dramatic": "Rewrite with dramatic tension and emotional impact while staying factual.",
-            "academic": "Rewrite in formal academic style with precise language.",
-            "business": "Rewrite in concise executive-friendly business style.",
-            "simplified": "Rewrite in plain language for easy understanding."
-        }
-        
-        instruction = style_instructions.get(request.style, style_instructions["professional"])
-        
-        user_prompt = f"""{instruction}
 
-Original text:
-{request.content}
+async def _stream_generation(pieces: AsyncIterator[str], cache_key: tuple) -> AsyncIterator[bytes]:
+    """
+    Relay generated text as SSE and cache the full result once complete.
+    Errors after the response has started are reported as an 'error' event.
+    """
+    parts = []
+    try:
+        async for piece in pieces:
+            parts.append(piece)
+            yield _sse_event(piece)
+    except Exception as e:
+        logger.error(f"Error while streaming generation: {e}", exc_info=True)
+        yield _sse_event(str(e), event="error")
+        return
+    
+    await _set_cached_generation(cache_key, "".join(parts).strip())
+    yield _sse_event("", event="done")
 
-Rewritten text:"""
+
+@router.post("/rewrite")
+async def rewrite_content(request: RewriteRequest, no_cache: bool = False):
+    """
+    Advanced document rewriting with production-grade quality.
+    Uses enterprise system prompt for professional editing.
+    Pass no_cache=true to force a fresh generation.
+    """
+    try:
+        cache_key = _generation_cache_key("rewrite", request.style, content=request.content)
+        rewritten = None if no_cache else await _get_cached_generation(cache_key)
+        if rewritten is not None:
+            return {
+                "original": request.content,
+                "rewritten": rewritten,
+                "style": request.style,
+                "quality": "enterprise-grade"
+            }
         
-        response = client.chat.completions.create(
+        client, model = get_rewrite_client()
+        
+        response = await client.chat.completions.create(
             model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+            messages=_build_rewrite_messages(request),
             temperature=0.7,
             max_tokens=4000  # Increased for longer documents
         )
         
         rewritten = response.choices[0].message.content.strip()
+        await _set_cached_generation(cache_key, rewritten)
         
         return {
             "original": request.content,
@@ -422,31 +572,70 @@ Rewritten text:"""
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/rewrite/stream")
+async def rewrite_content_stream(request: RewriteRequest, no_cache: bool = False):
+    """
+    Streaming variant of /rewrite.
+    
+    Responds with Server-Sent Events: each `data:` line is a JSON-encoded
+    string holding the next piece of rewritten text, followed by a final
+    `event: done` (or `event: error` with the message).
+    """
+    cache_key = _generation_cache_key("rewrite", request.style, content=request.content)
+    cached = None if no_cache else await _get_cached_generation(cache_key)
+    
+    async def pieces() -> AsyncIterator[str]:
+        if cached is not None:
+            yield cached
+            return
+        
+        client, model = get_rewrite_client()
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=_build_rewrite_messages(request),
+            temperature=0.7,
+            max_tokens=4000,
+            stream=True
+        )
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+    
+    return StreamingResponse(_stream_generation(pieces(), cache_key), media_type="text/event-stream")
+
+
 @router.post("/improve-flow")
-async def improve_flow(request: ImproveFlowRequest):
+async def improve_flow(request: ImproveFlowRequest, no_cache: bool = False):
     """
     Production-grade flow improvement using FlowEngine.
     Supports long documents, multiple tones, and strict content preservation.
+    Pass no_cache=true to force a fresh generation.
     """
     try:
-        from app.services.creative_assistant.flow_engine import FlowEngine
-        
         logger.info(f"Flow improvement request: tone={request.tone}, length={len(request.content)}")
         
-        # Initialize Flow Engine
-        flow_engine = FlowEngine()
-        
-        # Process with Flow Engine
-        result = await flow_engine.improve_flow(
-            content=request.content,
-            tone=request.tone,
-            preserve_formatting=request.preserve_formatting
+        cache_key = _generation_cache_key(
+            "improve-flow", request.tone, request.preserve_formatting, content=request.content
         )
-        
-        logger.info(f"Flow improvement complete: chunks={result['chunks_processed']}, tokens={result['tokens_used']}")
+        result = None if no_cache else await _get_cached_generation(cache_key)
+        
+        if result is None:
+            # Process with Flow Engine
+            result = await get_flow_engine().improve_flow(
+                content=request.content,
+                tone=request.tone,
+                preserve_formatting=request.preserve_formatting
+            )
+            # The key already pins the input, so the cache doesn't hold a second copy of it
+            await _set_cached_generation(
+                cache_key, {k: v for k, v in result.items() if k != "original"}
+            )
+            
+            logger.info(f"Flow improvement complete: chunks={result['chunks_processed']}, tokens={result['tokens_used']}")
         
         return {
-            "original": result["original"],
+            "original": request.content,
             "improved": result["improved"],
             "tone": result["tone"],
             "focus": request.focus,  # Legacy compatibility
@@ -464,6 +653,73 @@ async def improve_flow(request: ImproveFlowRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/improve-flow/stream")
+async def improve_flow_stream(request: ImproveFlowRequest, no_cache: bool = False):
+    """
+    Streaming variant of /improve-flow.
+    
+    Uses the same Server-Sent Events format as /rewrite/stream. Long
+    documents arrive chunk by chunk rather than token by token.
+    """
+    cache_key = _generation_cache_key(
+        "improve-flow-stream", request.tone, request.preserve_formatting, content=request.content
+    )
+    cached = None if no_cache else await _get_cached_generation(cache_key)
+    
+    async def pieces() -> AsyncIterator[str]:
+        if cached is not None:
+            yield cached
+            return
+        
+        async for piece in get_flow_engine().stream_improve_flow(
+            content=request.content,
+            tone=request.tone,
+            preserve_formatting=request.preserve_formatting
+        ):
+            yield piece
+    
+    return StreamingResponse(_stream_generation(pieces(), cache_key), media_type="text/event-stream")
+
+
+# Upload limits for /upload-file
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+UPLOAD_READ_CHUNK_BYTES = 1024 * 1024
+
+# PDFium is not thread-safe; only one worker thread may use it at a time
+_pdfium_lock = threading.Lock()
+
+
+def _extract_pdf(content: bytearray) -> str:
+    """
+    Extract text from PDF bytes (CPU-bound; run in a worker thread).
+    Uses PDFium when available, which is much faster than PyPDF2 and
+    releases the GIL while parsing. PDFium calls are serialized by
+    _pdfium_lock for the whole lifetime of the document.
+    """
+    if pdfium is None:
+        if PyPDF2 is None:
+            raise ImportError("No PDF parser installed")
+        
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
+        return "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
+    
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(io.BytesIO(content))
+        try:
+            return "\n".join(page.get_textpage().get_text_range() for page in pdf)
+        finally:
+            pdf.close()
+
+
+def _extract_docx(content: bytearray) -> str:
+    """Extract text from DOCX bytes (CPU-bound; run in a worker thread)."""
+    if docx is None:
+        raise ImportError("python-docx is not installed")
+    
+    doc = docx.Document(io.BytesIO(content))
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs)
+
+
 @router.post("/upload-file")
 async def upload_file(file: UploadFile = File(...)):
     """
@@ -477,40 +733,45 @@ async def upload_file(file: UploadFile = File(...)):
         if not (filename.endswith('.pdf') or filename.endswith('.docx') or filename.endswith('.txt')):
             raise HTTPException(status_code=400, detail="Only PDF, DOCX, and TXT files are supported")
         
-        # Read file content
-        content = await file.read()
+        # Read file content in bounded chunks so an oversized upload is
+        # rejected before it is fully buffered
+        content = bytearray()
+        while chunk := await file.read(UPLOAD_READ_CHUNK_BYTES):
+            content.extend(chunk)
+            if len(content) > MAX_UPLOAD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)"
+                )
         extracted_text = ""
         
         # Extract text based on file type
         if filename.endswith('.txt'):
-            extracted_text = content.decode('utf-8', errors='ignore')
+            # utf-8-sig drops a leading BOM (Windows editors) in the same pass;
+            # undecodable bytes become U+FFFD instead of vanishing silently
+            extracted_text = content.decode('utf-8-sig', errors='replace')
         
         elif filename.endswith('.pdf'):
             try:
-                import PyPDF2
-                pdf_file = io.BytesIO(content)
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                for page in pdf_reader.pages:
-                    extracted_text += page.extract_text() + "\n"
+                extracted_text = await asyncio.to_thread(_extract_pdf, content)
             except ImportError:
-                raise HTTPException(status_code=500, detail="PDF support not available. Install PyPDF2.")
+                raise HTTPException(status_code=500, detail="PDF support not available. Install pypdfium2.")
         
         elif filename.endswith('.docx'):
             try:
-                import docx
-                docx_file = io.BytesIO(content)
-                doc = docx.Document(docx_file)
-                for paragraph in doc.paragraphs:
-                    extracted_text += paragraph.text + "\n"
+                extracted_text = await asyncio.to_thread(_extract_docx, content)
             except ImportError:
                 raise HTTPException(status_code=500, detail="DOCX support not available. Install python-docx.")
         
+        stripped = extracted_text.strip()
         return {
             "filename": file.filename,
-            "text": extracted_text.strip(),
-            "length": len(extracted_text.strip())
+            "text": stripped,
+            "length": len(stripped)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading file: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
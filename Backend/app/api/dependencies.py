@@ -7,7 +7,7 @@ from fastapi import Header, HTTPException
 from typing import Optional
 import logging
 
-from app.api.auth import active_sessions, get_user_db
+from app.api.auth import get_user_from_session
 
 logger = logging.getLogger(__name__)
 
@@ -34,19 +34,8 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
     
     session_token = authorization[7:]  # Remove "Bearer " prefix
     
-    # Validate session exists
-    if session_token not in active_sessions:
-        raise HTTPException(status_code=401, detail="Invalid or expired session")
-    
-    # Get user from session
-    user_id = active_sessions[session_token]
-    db = get_user_db()
-    user = db.get_user_by_id(user_id)
-    
-    if not user:
-        # Session exists but user doesn't - cleanup
-        del active_sessions[session_token]
-        raise HTTPException(status_code=401, detail="User not found")
+    # Validate session and load user (raises 401 if invalid)
+    user = await get_user_from_session(session_token)
     
     logger.debug(f"Authenticated user: {user['email']}")
     return user
@@ -3,15 +3,95 @@ API routes for Knowledge Graph (Story Memory)
 """
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import base64
+import json
 import logging
+import orjson
+from cachetools import TTLCache
 
 from app.services.knowledge_graph import graph_db
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/graph", tags=["Knowledge Graph"])
+# Graph payloads are large nested dicts; orjson renders them much faster
+router = APIRouter(
+    prefix="/api/v1/graph",
+    tags=["Knowledge Graph"],
+    default_response_class=ORJSONResponse,
+)
+
+# Read responses are cached per query; keys include the manuscript's write
+# version so a save invalidates them in this process immediately, and the
+# TTL bounds staleness for writes made by other workers.
+GRAPH_CACHE_TTL_SECONDS = 60
+_response_cache = TTLCache(maxsize=1024, ttl=GRAPH_CACHE_TTL_SECONDS)
+
+
+# node_type values accepted by /nodes, mapped to the labels they MATCH on
+NODE_TYPE_LABELS = {
+    "Character": "Character:NarrativeEntity",
+    "Location": "Location:NarrativeEntity",
+}
+
+
+# Query texts are fixed so Neo4j's plan cache reuses one compiled plan per
+# text; optional filters are switched off by passing null parameters.
+_NODES_QUERY_TEMPLATE = """
+    CALL {{
+        MATCH (n:{labels} {{manuscript_id: $mid}})
+        RETURN count(n) as total
+    }}
+    CALL {{
+        MATCH (n:{labels} {{manuscript_id: $mid}})
+        WHERE $after IS NULL OR n.name > $after
+        WITH n
+        ORDER BY n.name
+        SKIP $offset
+        LIMIT $limit
+        RETURN collect({{n: n, first_appearance: n.first_appearance, last_appearance: n.last_appearance}}) as page
+    }}
+    RETURN total, page
+"""
+_NODES_QUERIES = {
+    node_type: _NODES_QUERY_TEMPLATE.format(labels=labels)
+    for node_type, labels in [(None, "NarrativeEntity"), *NODE_TYPE_LABELS.items()]
+}
+
+# The count ignores the page cursor; the page resumes after the last
+# (source, target, type) seen
+_EDGES_QUERY = """
+    CALL {
+        MATCH (a:NarrativeEntity {manuscript_id: $mid})-[r]->(b:NarrativeEntity {manuscript_id: $mid})
+        WHERE ($source IS NULL OR a.name = $source)
+          AND ($target IS NULL OR b.name = $target)
+          AND ($rel_type IS NULL OR type(r) = $rel_type)
+        RETURN count(r) as total
+    }
+    CALL {
+        MATCH (a:NarrativeEntity {manuscript_id: $mid})-[r]->(b:NarrativeEntity {manuscript_id: $mid})
+        WHERE ($source IS NULL OR a.name = $source)
+          AND ($target IS NULL OR b.name = $target)
+          AND ($rel_type IS NULL OR type(r) = $rel_type)
+          AND ($after_source IS NULL
+               OR a.name > $after_source
+               OR (a.name = $after_source AND b.name > $after_target)
+               OR (a.name = $after_source AND b.name = $after_target AND type(r) > $after_type))
+        WITH a.name as source, b.name as target, type(r) as rel_type, properties(r) as props
+        ORDER BY source, target, rel_type
+        SKIP $offset
+        LIMIT $limit
+        RETURN collect({source: source, target: target, rel_type: rel_type, props: props}) as page
+    }
+    RETURN total, page
+"""
+
+
+def _cache_key(endpoint: str, manuscript_id: Optional[str], *args) -> tuple:
+    return (endpoint, manuscript_id, graph_db.version(manuscript_id), *args)
 
 
 # Response Models
@@ -72,112 +152,191 @@ class FullGraphResponse(BaseModel):
     metadata: Dict[str, Any]
 
 
+def _encode_edge_cursor(source: str, target: str, rel_type: str) -> str:
+    """Opaque keyset cursor for the last edge of a page."""
+    return base64.urlsafe_b64encode(json.dumps([source, target, rel_type]).encode()).decode()
+
+
+def _decode_edge_cursor(cursor: str) -> Tuple[str, str, str]:
+    try:
+        source, target, rel_type = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return source, target, rel_type
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid edge cursor")
+
+
+def _node_id(primary_type: str, node) -> str:
+    """API id for a node; slug is stored at write time, derived only for legacy nodes."""
+    slug = node.get("slug") or node["name"].lower().replace(" ", "_")
+    return f"{primary_type.lower()}_{slug}"
+
+
+def _to_graph_node(node, first_appearance, last_appearance) -> GraphNode:
+    """Build the API node from a Neo4j node and its scene appearance range."""
+    node_labels = list(node.labels)
+    
+    # Determine primary type (Character or Location)
+    primary_type = "NarrativeEntity"
+    if "Character" in node_labels:
+        primary_type = "Character"
+    elif "Location" in node_labels:
+        primary_type = "Location"
+    
+    return GraphNode(
+        id=_node_id(primary_type, node),
+        name=node["name"],
+        type=primary_type,
+        properties=dict(node),
+        first_appearance=first_appearance,
+        last_appearance=last_appearance
+    )
+
+
+async def _fetch_nodes(
+    session,
+    manuscript_id: str,
+    node_type: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    after_name: Optional[str] = None,
+) -> Tuple[List[GraphNode], int]:
+    """Fetch one page of nodes and the total matching count on an open session."""
+    # Matching on the type label directly lets Neo4j start from the
+    # label index; only whitelisted labels have a query
+    query = _NODES_QUERIES.get(node_type or None)
+    if query is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown node_type '{node_type}'. Expected one of: {', '.join(NODE_TYPE_LABELS)}"
+        )
+    
+    params = {"mid": manuscript_id, "offset": offset, "limit": limit, "after": after_name}
+    
+    result = await session.run(query, **params)
+    record = await result.single()
+    total = record["total"]
+
+    nodes = [
+        _to_graph_node(row["n"], row["first_appearance"], row["last_appearance"])
+        for row in record["page"]
+    ]
+    return nodes, total
+
+
+async def _fetch_edges(
+    session,
+    manuscript_id: str,
+    source: Optional[str] = None,
+    target: Optional[str] = None,
+    relationship_type: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Tuple[List[GraphEdge], int]:
+    """Fetch one page of edges and the total matching count on an open session."""
+    params = {
+        "mid": manuscript_id,
+        "offset": offset,
+        "limit": limit,
+        "source": source or None,
+        "target": target or None,
+        "rel_type": relationship_type or None,
+        "after_source": None,
+        "after_target": None,
+        "after_type": None,
+    }
+    if cursor is not None:
+        params["after_source"], params["after_target"], params["after_type"] = _decode_edge_cursor(cursor)
+    
+    result = await session.run(_EDGES_QUERY, **params)
+    record = await result.single()
+    total = record["total"]
+
+    edges = [
+        GraphEdge(
+            source=row["source"],
+            target=row["target"],
+            type=row["rel_type"],
+            properties=dict(row["props"]) if row["props"] else {}
+        )
+        for row in record["page"]
+    ]
+    return edges, total
+
+
+async def _count_node_types(session, manuscript_id: str) -> Dict[str, int]:
+    """Count characters and locations in Cypher, over the whole manuscript."""
+    result = await session.run("""
+        CALL {
+            MATCH (n:Character:NarrativeEntity {manuscript_id: $mid})
+            RETURN count(n) as characters
+        }
+        CALL {
+            MATCH (n:Location:NarrativeEntity {manuscript_id: $mid})
+            RETURN count(n) as locations
+        }
+        RETURN characters, locations
+    """, mid=manuscript_id)
+    record = await result.single()
+    return {"characters": record["characters"], "locations": record["locations"]}
+
+
 # Endpoints
 @router.get("/nodes", response_model=GraphNodesResponse)
 async def get_nodes(
     manuscript_id: str = Query(..., description="Manuscript identifier"),
     node_type: Optional[str] = Query(None, description="Filter by node type (Character, Location)"),
     limit: int = Query(50, ge=1, le=500, description="Maximum number of nodes to return"),
-    offset: int = Query(0, ge=0, description="Offset for pagination")
+    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    after_name: Optional[str] = Query(None, description="Keyset cursor: return nodes named after this (metadata.next_cursor)")
 ):
     """
     Query nodes from the knowledge graph.
     
     Returns characters, locations, and other entities from the story.
+    Prefer after_name over offset for deep pages: it seeks the
+    (manuscript_id, name) index instead of skipping rows.
     
     Args:
         manuscript_id: Story identifier
         node_type: Optional filter by type (Character, Location)
         limit: Maximum results (1-500)
         offset: Pagination offset
+        after_name: Keyset cursor from a previous page's metadata.next_cursor
         
     Returns:
         List of graph nodes with metadata
     """
+    cache_key = _cache_key("nodes", manuscript_id, node_type, limit, offset, after_name)
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         logger.info(f"Querying nodes for manuscript: {manuscript_id}, type: {node_type}")
         
-        with graph_db.driver.session() as session:
-            # Build query
-            if node_type:
-                query = """
-                    MATCH (n:NarrativeEntity {manuscript_id: $mid})
-                    WHERE $type IN labels(n)
-                    OPTIONAL MATCH (n)-[:APPEARS_IN]->(s:Scene)
-                    WITH n, 
-                         min(s.created_at) as first_appearance,
-                         max(s.created_at) as last_appearance
-                    RETURN n, first_appearance, last_appearance
-                    ORDER BY n.name
-                    SKIP $offset
-                    LIMIT $limit
-                """
-                params = {"mid": manuscript_id, "type": node_type, "offset": offset, "limit": limit}
-            else:
-                query = """
-                    MATCH (n:NarrativeEntity {manuscript_id: $mid})
-                    OPTIONAL MATCH (n)-[:APPEARS_IN]->(s:Scene)
-                    WITH n, 
-                         min(s.created_at) as first_appearance,
-                         max(s.created_at) as last_appearance
-                    RETURN n, first_appearance, last_appearance
-                    ORDER BY n.name
-                    SKIP $offset
-                    LIMIT $limit
-                """
-                params = {"mid": manuscript_id, "offset": offset, "limit": limit}
-            
-            result = session.run(query, **params)
-            
-            nodes = []
-            for record in result:
-                node = record["n"]
-                node_labels = list(node.labels)
-                
-                # Determine primary type (Character or Location)
-                primary_type = "NarrativeEntity"
-                if "Character" in node_labels:
-                    primary_type = "Character"
-                elif "Location" in node_labels:
-                    primary_type = "Location"
-                
-                nodes.append(GraphNode(
-                    id=f"{primary_type.lower()}_{node['name'].lower().replace(' ', '_')}",
-                    name=node["name"],
-                    type=primary_type,
-                    properties=dict(node),
-                    first_appearance=record.get("first_appearance"),
-                    last_appearance=record.get("last_appearance")
-                ))
-            
-            # Get total count
-            count_query = """
-                MATCH (n:NarrativeEntity {manuscript_id: $mid})
-                RETURN count(n) as total
-            """
-            if node_type:
-                count_query = f"""
-                    MATCH (n:NarrativeEntity {{manuscript_id: $mid}})
-                    WHERE $type IN labels(n)
-                    RETURN count(n) as total
-                """
-            
-            count_result = session.run(count_query, mid=manuscript_id, type=node_type if node_type else None)
-            total = count_result.single()["total"]
+        async with graph_db.async_driver.session() as session:
+            nodes, total = await _fetch_nodes(session, manuscript_id, node_type, limit, offset, after_name)
         
         logger.info(f"Found {len(nodes)} nodes (total: {total})")
         
-        return GraphNodesResponse(
+        response = GraphNodesResponse(
             nodes=nodes,
             total=total,
             metadata={
                 "manuscript_id": manuscript_id,
                 "node_type": node_type,
                 "limit": limit,
-                "offset": offset
+                "offset": offset,
+                "after_name": after_name,
+                "next_cursor": nodes[-1].name if len(nodes) == limit else None
             }
         )
+        _response_cache[cache_key] = response
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error querying nodes: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to query nodes: {str(e)}")
@@ -190,12 +349,15 @@ async def get_edges(
     target: Optional[str] = Query(None, description="Filter by target node name"),
     relationship_type: Optional[str] = Query(None, description="Filter by relationship type"),
     limit: int = Query(50, ge=1, le=500, description="Maximum number of edges to return"),
-    offset: int = Query(0, ge=0, description="Offset for pagination")
+    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page (metadata.next_cursor)")
 ):
     """
     Query relationships (edges) from the knowledge graph.
     
     Returns relationships between characters, locations, and other entities.
+    Prefer cursor over offset for deep pages: it resumes after the last
+    (source, target, type) seen instead of skipping rows.
     
     Args:
         manuscript_id: Story identifier
@@ -204,68 +366,27 @@ async def get_edges(
         relationship_type: Optional filter by relationship type
         limit: Maximum results (1-500)
         offset: Pagination offset
+        cursor: Opaque keyset cursor from a previous page's metadata.next_cursor
         
     Returns:
         List of graph edges with metadata
     """
+    cache_key = _cache_key("edges", manuscript_id, source, target, relationship_type, limit, offset, cursor)
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         logger.info(f"Querying edges for manuscript: {manuscript_id}")
         
-        with graph_db.driver.session() as session:
-            # Build dynamic query based on filters
-            where_clauses = ["a.manuscript_id = $mid", "b.manuscript_id = $mid"]
-            params = {"mid": manuscript_id, "offset": offset, "limit": limit}
-            
-            if source:
-                where_clauses.append("a.name = $source")
-                params["source"] = source
-            
-            if target:
-                where_clauses.append("b.name = $target")
-                params["target"] = target
-            
-            where_clause = " AND ".join(where_clauses)
-            
-            # Note: We can't filter by relationship type in WHERE clause easily
-            # So we'll filter in Python if needed
-            query = f"""
-                MATCH (a:NarrativeEntity)-[r]->(b:NarrativeEntity)
-                WHERE {where_clause}
-                RETURN a.name as source, b.name as target, type(r) as rel_type, properties(r) as props
-                ORDER BY a.name, b.name
-                SKIP $offset
-                LIMIT $limit
-            """
-            
-            result = session.run(query, **params)
-            
-            edges = []
-            for record in result:
-                rel_type = record["rel_type"]
-                
-                # Apply relationship type filter if specified
-                if relationship_type and rel_type != relationship_type:
-                    continue
-                
-                edges.append(GraphEdge(
-                    source=record["source"],
-                    target=record["target"],
-                    type=rel_type,
-                    properties=dict(record["props"]) if record["props"] else {}
-                ))
-            
-            # Get total count
-            count_query = f"""
-                MATCH (a:NarrativeEntity)-[r]->(b:NarrativeEntity)
-                WHERE {where_clause}
-                RETURN count(r) as total
-            """
-            count_result = session.run(count_query, **{k: v for k, v in params.items() if k not in ['offset', 'limit']})
-            total = count_result.single()["total"]
+        async with graph_db.async_driver.session() as session:
+            edges, total = await _fetch_edges(
+                session, manuscript_id, source, target, relationship_type, limit, offset, cursor
+            )
         
         logger.info(f"Found {len(edges)} edges (total: {total})")
         
-        return GraphEdgesResponse(
+        response = GraphEdgesResponse(
             edges=edges,
             total=total,
             metadata={
@@ -274,10 +395,19 @@ async def get_edges(
                 "target": target,
                 "relationship_type": relationship_type,
                 "limit": limit,
-                "offset": offset
+                "offset": offset,
+                "cursor": cursor,
+                "next_cursor": (
+                    _encode_edge_cursor(edges[-1].source, edges[-1].target, edges[-1].type)
+                    if len(edges) == limit else None
+                )
             }
         )
+        _response_cache[cache_key] = response
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error querying edges: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to query edges: {str(e)}")
@@ -300,10 +430,15 @@ async def get_node_details(
     Returns:
         Detailed node information
     """
+    cache_key = _cache_key("node", manuscript_id, node_name)
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         logger.info(f"Querying node details: {node_name} in manuscript: {manuscript_id}")
         
-        with graph_db.driver.session() as session:
+        async with graph_db.async_driver.session() as session:
             # Get node with relationships
             query = """
                 MATCH (n:NarrativeEntity {name: $name, manuscript_id: $mid})
@@ -314,8 +449,8 @@ async def get_node_details(
                        collect(DISTINCT {scene_id: s.id, timestamp: s.created_at}) as appearances
             """
             
-            result = session.run(query, name=node_name, mid=manuscript_id)
-            record = result.single()
+            result = await session.run(query, name=node_name, mid=manuscript_id)
+            record = await result.single()
             
             if not record:
                 raise HTTPException(status_code=404, detail=f"Node '{node_name}' not found")
@@ -329,9 +464,9 @@ async def get_node_details(
             elif "Location" in node_labels:
                 primary_type = "Location"
             
-            return {
+            response = {
                 "node": {
-                    "id": f"{primary_type.lower()}_{node['name'].lower().replace(' ', '_')}",
+                    "id": _node_id(primary_type, node),
                     "name": node["name"],
                     "type": primary_type,
                     "properties": dict(node),
@@ -340,6 +475,9 @@ async def get_node_details(
                 }
             }
         
+        _response_cache[cache_key] = response
+        return response
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -362,56 +500,97 @@ async def get_full_graph(
     Returns:
         Complete graph with all nodes and edges
     """
+    cache_key = _cache_key("full", manuscript_id)
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         logger.info(f"Exporting full graph for manuscript: {manuscript_id}")
         
-        # Get all nodes - pass actual values, not Query objects
-        nodes_response = await get_nodes(
-            manuscript_id=manuscript_id,
-            node_type=None,
-            limit=500,
-            offset=0
-        )
+        # Nodes, edges and type counts are independent reads; each fetch
+        # gets its own session so the round-trips overlap
+        async def fetch(fetcher, **kwargs):
+            async with graph_db.async_driver.session() as session:
+                return await fetcher(session, manuscript_id, **kwargs)
         
-        # Get all edges - pass actual values, not Query objects
-        edges_response = await get_edges(
-            manuscript_id=manuscript_id,
-            source=None,
-            target=None,
-            relationship_type=None,
-            limit=500,
-            offset=0
+        (nodes, node_total), (edges, edge_total), type_counts = await asyncio.gather(
+            fetch(_fetch_nodes, limit=500),
+            fetch(_fetch_edges, limit=500),
+            fetch(_count_node_types)
         )
         
         metadata = {
             "manuscript_id": manuscript_id,
-            "node_count": nodes_response.total,
-            "edge_count": edges_response.total,
-            "character_count": len([n for n in nodes_response.nodes if n.type == "Character"]),
-            "location_count": len([n for n in nodes_response.nodes if n.type == "Location"])
+            "node_count": node_total,
+            "edge_count": edge_total,
+            "character_count": type_counts["characters"],
+            "location_count": type_counts["locations"]
         }
         
         logger.info(f"Graph export complete: {metadata['node_count']} nodes, {metadata['edge_count']} edges")
         
-        return FullGraphResponse(
-            nodes=nodes_response.nodes,
-            edges=edges_response.edges,
+        response = FullGraphResponse(
+            nodes=nodes,
+            edges=edges,
             metadata=metadata
         )
+        _response_cache[cache_key] = response
+        return response
         
     except Exception as e:
         logger.error(f"Error exporting graph: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to export graph: {str(e)}")
 
 
+@router.get("/export")
+async def export_graph_stream(
+    manuscript_id: str = Query(..., description="Manuscript identifier")
+):
+    """
+    Stream the complete knowledge graph as NDJSON.
+    
+    Unlike the JSON export this is not capped at 500 nodes/edges: each line
+    is written as soon as its record arrives from Neo4j (the driver pulls
+    fetch_size records at a time), so memory stays flat for large graphs.
+    
+    Args:
+        manuscript_id: Story identifier
+        
+    Returns:
+        One {"kind": "node" | "edge", ...} object per line
+    """
+    async def generate():
+        async with graph_db.async_driver.session() as session:
+            result = await session.run("""
+                MATCH (n:NarrativeEntity {manuscript_id: $mid})
+                RETURN n, n.first_appearance as first_appearance, n.last_appearance as last_appearance
+                ORDER BY n.name
+            """, mid=manuscript_id)
+            async for record in result:
+                node = _to_graph_node(record["n"], record["first_appearance"], record["last_appearance"])
+                yield orjson.dumps({"kind": "node", **node.model_dump()}) + b"\n"
+            
+            result = await session.run("""
+                MATCH (a:NarrativeEntity {manuscript_id: $mid})-[r]->(b:NarrativeEntity {manuscript_id: $mid})
+                RETURN a.name as source, b.name as target, type(r) as type, properties(r) as properties
+                ORDER BY source, target, type
+            """, mid=manuscript_id)
+            async for record in result:
+                yield orjson.dumps({"kind": "edge", **record.data()}) + b"\n"
+    
+    logger.info(f"Streaming graph export for manuscript: {manuscript_id}")
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint for Knowledge Graph service."""
     try:
         # Test Neo4j connection
-        with graph_db.driver.session() as session:
-            result = session.run("RETURN 1 as test")
-            result.single()
+        async with graph_db.async_driver.session() as session:
+            result = await session.run("RETURN 1 as test")
+            await result.single()
         
         return {
             "status": "healthy",
@@ -436,8 +615,13 @@ async def list_manuscripts():
     List all manuscripts in the database with their entity counts.
     Useful for finding the correct manuscript_id to query.
     """
+    cache_key = _cache_key("manuscripts", None)
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        with graph_db.driver.session() as session:
+        async with graph_db.async_driver.session() as session:
             # Get all unique manuscript IDs with counts
             query = """
                 MATCH (n:NarrativeEntity)
@@ -448,10 +632,10 @@ async def list_manuscripts():
                        count(*) as total_nodes
                 ORDER BY manuscript_id
             """
-            result = session.run(query)
+            result = await session.run(query)
             
             manuscripts = []
-            for record in result:
+            async for record in result:
                 manuscripts.append({
                     "manuscript_id": record["manuscript_id"],
                     "characters": record["characters"],
@@ -465,15 +649,17 @@ async def list_manuscripts():
                 WHERE a.manuscript_id = b.manuscript_id
                 RETURN a.manuscript_id as manuscript_id, count(r) as relationships
             """
-            rel_result = session.run(rel_query)
+            rel_result = await session.run(rel_query)
             
-            rel_counts = {r["manuscript_id"]: r["relationships"] for r in rel_result}
+            rel_counts = {r["manuscript_id"]: r["relationships"] async for r in rel_result}
             
             for m in manuscripts:
                 m["relationships"] = rel_counts.get(m["manuscript_id"], 0)
         
         logger.info(f"Found {len(manuscripts)} manuscripts in database")
-        return {"manuscripts": manuscripts, "total": len(manuscripts)}
+        response = {"manuscripts": manuscripts, "total": len(manuscripts)}
+        _response_cache[cache_key] = response
+        return response
         
     except Exception as e:
         logger.error(f"Error listing manuscripts: {e}", exc_info=True)
@@ -487,15 +673,15 @@ async def debug_database():
     Use this to verify data is being stored correctly.
     """
     try:
-        with graph_db.driver.session() as session:
+        async with graph_db.async_driver.session() as session:
             # Get all nodes
             nodes_query = """
                 MATCH (n:NarrativeEntity)
                 RETURN n.name as name, n.manuscript_id as manuscript_id, labels(n) as labels
                 LIMIT 100
             """
-            nodes_result = session.run(nodes_query)
-            nodes = [dict(r) for r in nodes_result]
+            nodes_result = await session.run(nodes_query)
+            nodes = [dict(r) async for r in nodes_result]
             
             # Get all relationships
             rels_query = """
@@ -503,8 +689,8 @@ async def debug_database():
                 RETURN a.name as source, type(r) as type, b.name as target, a.manuscript_id as manuscript_id
                 LIMIT 100
             """
-            rels_result = session.run(rels_query)
-            relationships = [dict(r) for r in rels_result]
+            rels_result = await session.run(rels_query)
+            relationships = [dict(r) async for r in rels_result]
         
         return {
             "nodes": nodes,
@@ -8,22 +8,94 @@ Endpoints:
 - GET /api/v1/manuscript/{id} - Get manuscript by ID
 - GET /api/v1/manuscript - List all manuscripts
 - DELETE /api/v1/manuscript/{id} - Delete a manuscript
+- POST /api/v1/manuscript/summaries/{id}/generate-voice - Stream summary audio
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, File, Form, Query, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
-from pathlib import Path
+import asyncio
+import hashlib
 import logging
+import os
 
-from app.services.manuscript import ManuscriptProcessor
+import redis
+
+from app.services.manuscript import BaseSummarizer, ManuscriptProcessor, get_manuscript_processor, get_summarizer
 from app.db.manuscript_repository import get_manuscript_repository
+from app.db.redis_client import get_async_redis
 from app.api.dependencies import get_current_user
 from bson.objectid import ObjectId
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/manuscript", tags=["Manuscript"])
+router = APIRouter(
+    prefix="/api/v1/manuscript",
+    tags=["Manuscript"],
+    default_response_class=ORJSONResponse,
+)
+
+# Uploads larger than this are rejected before any parsing
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+# Longest text accepted in a JSON body (about a book chapter)
+MAX_TEXT_CHARS = 200_000
+
+# Stored fields ManuscriptDetailResponse is built from
+DETAIL_FIELDS = (
+    "title", "original_text", "summary", "word_count", "created_at",
+    "created_at_iso", "model_used", "file_type", "file_name",
+)
+
+# Upload extensions the text extractor can parse
+ALLOWED_FILE_TYPES = frozenset({"pdf", "docx", "txt"})
+
+
+def get_default_summarizer() -> BaseSummarizer:
+    """Dependency returning the shared Groq summarizer."""
+    return get_summarizer(provider="groq")
+
+
+# Summaries are cached by content so repeat saves of unchanged text skip the LLM
+SUMMARY_CACHE_TTL = 7 * 86400
+
+
+def _word_count(text: str) -> int:
+    return len(text.split())
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+async def summarize_cached(summarizer: BaseSummarizer, text: str, context: str) -> str:
+    """summarizer.summarize behind a Redis cache keyed on model, context and text."""
+    key = f"sum:{summarizer.model_name}:" + _text_hash(context + "\x00" + text)
+    try:
+        cached = await get_async_redis().get(key)
+        if cached is not None:
+            return cached
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Summary cache unavailable: {e}")
+    
+    summary = await summarizer.summarize(text=text, context=context)
+    
+    try:
+        await get_async_redis().setex(key, SUMMARY_CACHE_TTL, summary)
+    except redis.RedisError:
+        pass
+    return summary
+
+
+def _created_at(doc: Dict[str, Any]) -> str:
+    """ISO timestamp stored at insert; older documents are formatted on the fly."""
+    created_at = doc.get("created_at_iso")
+    if created_at is None:
+        created_at = doc.get("created_at")
+        if created_at:
+            created_at = created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
+    return created_at or ""
 
 
 # Response Models
@@ -73,13 +145,13 @@ class ManuscriptUploadResponse(BaseModel):
 class TextSubmitRequest(BaseModel):
     """Request for submitting raw text."""
     title: str = Field(..., min_length=1, max_length=500)
-    text: str = Field(..., min_length=10)
+    text: str = Field(..., min_length=10, max_length=MAX_TEXT_CHARS)
 
 
 class SaveAnalyzeRequest(BaseModel):
     """Request for save-and-analyze workflow."""
     title: str = Field(..., min_length=1, max_length=500)
-    text: str = Field(..., min_length=10)
+    text: str = Field(..., min_length=10, max_length=MAX_TEXT_CHARS)
     chapter: int = Field(default=1, ge=1)
     paragraph: int = Field(default=1, ge=1)
 
@@ -95,19 +167,13 @@ class SummaryResponse(BaseModel):
     paragraph: Optional[int] = None
 
 
-class VoiceResponse(BaseModel):
-    """Response for voice generation."""
-    audio_url: str
-    duration: float
-    voice_id: str
-
-
 # Endpoints
 
 @router.post("/upload", response_model=ManuscriptUploadResponse)
 async def upload_manuscript(
     file: UploadFile = File(..., description="Manuscript file (PDF, DOCX, or TXT)"),
-    title: Optional[str] = Form(None, description="Optional title (defaults to filename)")
+    title: Optional[str] = Form(None, description="Optional title (defaults to filename)"),
+    processor: ManuscriptProcessor = Depends(get_manuscript_processor)
 ):
     """
     Upload and process a manuscript file.
@@ -123,38 +189,42 @@ async def upload_manuscript(
         raise HTTPException(status_code=400, detail="No filename provided")
     
     # Get file extension
-    filename = file.filename.lower()
-    if filename.endswith(".pdf"):
-        file_type = "pdf"
-    elif filename.endswith(".docx"):
-        file_type = "docx"
-    elif filename.endswith(".txt"):
-        file_type = "txt"
-    else:
+    stem, ext = os.path.splitext(file.filename)
+    file_type = ext.lower().lstrip(".")
+    if file_type not in ALLOWED_FILE_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file type. Accepted: PDF, DOCX, TXT. Got: {filename}"
+            detail=f"Unsupported file type. Accepted: PDF, DOCX, TXT. Got: {file.filename.lower()}"
         )
     
     # Use filename as title if not provided
     if not title:
-        title = file.filename.rsplit(".", 1)[0]  # Remove extension
+        title = stem  # Filename without extension
     
-    # Read file content
+    # Starlette already spools large uploads to a temp file; hand that file
+    # to the extractor instead of reading the whole upload into memory
     try:
-        content = await file.read()
+        size = file.size
+        if size is None:
+            size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(0)
     except Exception as e:
         logger.error(f"Failed to read uploaded file: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
     
-    if len(content) == 0:
+    if size == 0:
         raise HTTPException(status_code=400, detail="File is empty")
     
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)"
+        )
+    
     # Process the manuscript
     try:
-        processor = ManuscriptProcessor()
         result = await processor.process(
-            file_content=content,
+            file_content=file.file,
             file_type=file_type,
             title=title,
             file_name=file.filename,
@@ -179,7 +249,8 @@ async def upload_manuscript(
 @router.post("/save-and-analyze", response_model=ManuscriptUploadResponse)
 async def save_and_analyze(
     request: SaveAnalyzeRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    summarizer: BaseSummarizer = Depends(get_default_summarizer)
 ):
     """
     Save manuscript and generate AI summary in a single atomic operation.
@@ -187,10 +258,9 @@ async def save_and_analyze(
     This is the primary endpoint for the manuscript editor's "Save & Analyze" button.
     
     Workflow:
-    1. Save manuscript text to MongoDB (without summary)
-    2. Generate AI summary using LLM
-    3. Update manuscript with generated summary
-    4. Return complete manuscript data including summary
+    1. Generate AI summary using LLM
+    2. Save manuscript with its summary to MongoDB in one insert
+    3. Return complete manuscript data including summary
     
     - **title**: Manuscript title
     - **text**: Manuscript content
@@ -200,49 +270,36 @@ async def save_and_analyze(
     try:
         repository = get_manuscript_repository()
         
-        # Calculate word count
-        word_count = len(request.text.split())
+        # Calculate word count off the event loop; the text can be several MB
+        word_count = await asyncio.to_thread(_word_count, request.text)
+        
+        # Step 1: Generate AI summary
+        logger.info(f"🤖 Generating summary for manuscript: {request.title} (user: {current_user['email']})")
+        summary = await summarize_cached(
+            summarizer,
+            text=request.text,
+            context=f"Manuscript: {request.title}"
+        )
+        
+        model_used = summarizer.model_name
+        logger.info(f"✨ Summary generated using {model_used}")
         
-        # Step 1: Save manuscript to MongoDB first (without summary)
-        logger.info(f"📝 Saving manuscript: {request.title} for user: {current_user['email']}")
-        manuscript = repository.create(
+        # Step 2: Save manuscript with its final values (single round-trip)
+        manuscript = await repository.create(
             title=request.title,
             original_text=request.text,
-            summary="",  # Empty initially
+            summary=summary,
             word_count=word_count,
-            model_used="",  # Will be updated after summarization
+            model_used=model_used,
             chapter=request.chapter,
             paragraph=request.paragraph,
             user_id=current_user["id"],
+            text_hash=_text_hash(request.text),
         )
         
         manuscript_id = manuscript["id"]
         logger.info(f"✅ Manuscript saved with ID: {manuscript_id}")
         
-        # Step 2: Generate AI summary
-        logger.info(f"🤖 Generating summary for manuscript {manuscript_id}")
-        from app.services.manuscript.summarizer import get_summarizer
-        
-        summarizer = get_summarizer(provider="groq")
-        summary = await summarizer.summarize(
-            text=request.text,
-            context=f"Manuscript: {request.title}"
-        )
-        
-        model_used = summarizer.model_name
-        logger.info(f"✨ Summary generated using {model_used}")
-        
-        # Step 3: Update manuscript with summary
-        success = repository.update_summary(manuscript_id, summary)
-        if not success:
-            logger.warning(f"⚠️ Failed to update summary for {manuscript_id}")
-        
-        # Step 4: Update model_used field
-        repository.collection.update_one(
-            {"_id": manuscript_id},
-            {"$set": {"model_used": model_used}}
-        )
-        
         # Return complete data
         return ManuscriptUploadResponse(
             id=manuscript_id,
@@ -261,7 +318,10 @@ async def save_and_analyze(
 
 
 @router.post("/submit-text", response_model=ManuscriptUploadResponse)
-async def submit_text(request: TextSubmitRequest):
+async def submit_text(
+    request: TextSubmitRequest,
+    processor: ManuscriptProcessor = Depends(get_manuscript_processor)
+):
     """
     Submit raw text for processing (no file upload).
     
@@ -269,7 +329,6 @@ async def submit_text(request: TextSubmitRequest):
     - **text**: The text content to process
     """
     try:
-        processor = ManuscriptProcessor()
         result = await processor.process_text(
             text=request.text,
             title=request.title,
@@ -297,68 +356,71 @@ async def get_manuscript(manuscript_id: str):
     
     Returns the full manuscript including original text.
     """
+    # Malformed ids (often crawlers) can't match anything; skip the round-trip
+    if not ObjectId.is_valid(manuscript_id):
+        raise HTTPException(status_code=404, detail="Manuscript not found")
+    
     repository = get_manuscript_repository()
-    manuscript = repository.get_by_id(manuscript_id)
+    manuscript = await repository.get_by_id(manuscript_id, fields=DETAIL_FIELDS)
     
     if not manuscript:
         raise HTTPException(status_code=404, detail="Manuscript not found")
     
-    # Convert datetime to string
-    created_at = manuscript.get("created_at")
-    if created_at:
-        created_at = created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
-    
-    return ManuscriptDetailResponse(
-        id=manuscript["id"],
-        title=manuscript["title"],
-        original_text=manuscript["original_text"],
-        summary=manuscript["summary"],
-        word_count=manuscript["word_count"],
-        created_at=created_at or "",
-        model_used=manuscript["model_used"],
-        file_type=manuscript.get("file_type"),
-        file_name=manuscript.get("file_name"),
-    )
+    # Fields come straight from our own documents, so skip re-validating
+    # (and copying) the full text through ManuscriptDetailResponse
+    return ORJSONResponse(content={
+        "id": manuscript["id"],
+        "title": manuscript["title"],
+        "original_text": manuscript["original_text"],
+        "summary": manuscript["summary"],
+        "word_count": manuscript["word_count"],
+        "created_at": _created_at(manuscript),
+        "model_used": manuscript["model_used"],
+        "file_type": manuscript.get("file_type"),
+        "file_name": manuscript.get("file_name"),
+    })
 
 
 @router.get("", response_model=ManuscriptListResponse)
 async def list_manuscripts(
     limit: int = Query(50, ge=1, le=100, description="Maximum results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
+    include_summary: bool = Query(True, description="Include each manuscript's summary"),
 ):
     """
     List all manuscripts.
     
-    Returns paginated list without full text content.
+    Returns paginated list without full text content. Pass
+    include_summary=false for a metadata-only listing (summary is "").
     """
     repository = get_manuscript_repository()
     
-    manuscripts = repository.list_all(limit=limit, offset=offset, include_text=False)
-    total = repository.count()
+    manuscripts, total = await repository.list_all(
+        limit=limit, offset=offset, include_text=False, include_summary=include_summary
+    )
     
-    results = []
-    for m in manuscripts:
-        created_at = m.get("created_at")
-        if created_at:
-            created_at = created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
-        
-        results.append(ManuscriptSummaryResponse(
-            id=m["id"],
-            title=m["title"],
-            summary=m["summary"],
-            word_count=m["word_count"],
-            created_at=created_at or "",
-            model_used=m["model_used"],
-            file_type=m.get("file_type"),
-            file_name=m.get("file_name"),
-        ))
+    # Rows come from our own collection; build plain dicts and return them
+    # directly so FastAPI doesn't validate every row against the models
+    results = [
+        {
+            "id": m["id"],
+            "title": m["title"],
+            "summary": m.get("summary", ""),
+            "word_count": m["word_count"],
+            "created_at": _created_at(m),
+            "model_used": m["model_used"],
+            "file_type": m.get("file_type"),
+            "file_name": m.get("file_name"),
+        }
+        for m in manuscripts
+    ]
     
-    return ManuscriptListResponse(
-        manuscripts=results,
-        total=total,
-        limit=limit,
-        offset=offset,
-    )
+    return ORJSONResponse(content={
+        "manuscripts": results,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+    })
 
 
 @router.delete("/{manuscript_id}")
@@ -366,16 +428,20 @@ async def delete_manuscript(manuscript_id: str):
     """
     Delete a manuscript by ID.
     """
-    repository = get_manuscript_repository()
-    
-    if not repository.get_by_id(manuscript_id):
+    if not ObjectId.is_valid(manuscript_id):
         raise HTTPException(status_code=404, detail="Manuscript not found")
     
-    success = repository.delete(manuscript_id)
+    repository = get_manuscript_repository()
     
-    if not success:
+    # delete_one reports whether a document matched, so no lookup is needed first
+    try:
+        deleted = await repository.delete(manuscript_id)
+    except Exception:
         raise HTTPException(status_code=500, detail="Failed to delete manuscript")
     
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Manuscript not found")
+    
     return {"message": "Manuscript deleted successfully", "id": manuscript_id}
 
 
@@ -384,7 +450,7 @@ async def health_check():
     """Health check for manuscript service."""
     try:
         repository = get_manuscript_repository()
-        count = repository.count()
+        count = await repository.count()
         return {"status": "healthy", "manuscript_count": count}
     except Exception as e:
         return {"status": "unhealthy", "error": str(e)}
@@ -400,23 +466,20 @@ async def get_latest_summary(current_user: dict = Depends(get_current_user)):
         repository = get_manuscript_repository()
         
         # Query: user_id match + has summary + sort by created_at desc + limit 1
-        manuscript = repository.collection.find_one(
-            {"user_id": current_user["id"], "summary": {"$ne": ""}},
+        manuscript = await repository.collection.find_one(
+            {"user_id": current_user["id"], "summary": repository.SUMMARY_PRESENT},
+            projection=repository.SUMMARY_PROJECTION,
             sort=[("created_at", -1)]
         )
         
         if not manuscript:
             raise HTTPException(status_code=404, detail="No summaries found")
         
-        created_at = manuscript.get("created_at")
-        if created_at:
-            created_at = created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
-        
         return SummaryResponse(
             id=str(manuscript["_id"]),
             title=manuscript["title"],
             summary=manuscript["summary"],
-            created_at=created_at or "",
+            created_at=_created_at(manuscript),
             word_count=manuscript["word_count"],
             chapter=manuscript.get("chapter"),
             paragraph=manuscript.get("paragraph")
@@ -440,52 +503,68 @@ async def get_user_summaries(
         repository = get_manuscript_repository()
         
         cursor = repository.collection.find(
-            {"user_id": current_user["id"], "summary": {"$ne": ""}},
+            {"user_id": current_user["id"], "summary": repository.SUMMARY_PRESENT},
+            projection=repository.SUMMARY_PROJECTION,
             sort=[("created_at", -1)],
             limit=limit
         )
         
-        results = []
-        for m in cursor:
-            created_at = m.get("created_at")
-            if created_at:
-                created_at = created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
-            
-            results.append(SummaryResponse(
-                id=str(m["_id"]),
-                title=m["title"],
-                summary=m["summary"],
-                created_at=created_at or "",
-                word_count=m["word_count"],
-                chapter=m.get("chapter"),
-                paragraph=m.get("paragraph")
-            ))
+        results = [
+            {
+                "id": str(m["_id"]),
+                "title": m["title"],
+                "summary": m["summary"],
+                "created_at": _created_at(m),
+                "word_count": m["word_count"],
+                "chapter": m.get("chapter"),
+                "paragraph": m.get("paragraph"),
+            }
+            async for m in cursor
+        ]
         
-        return results
+        return ORJSONResponse(content=results)
     except Exception as e:
         logger.error(f"Error fetching summaries: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch summaries")
 
 
-@router.post("/summaries/{summary_id}/generate-voice", response_model=VoiceResponse)
+SUMMARY_VOICE_ID = "en-US-AriaNeural"
+
+
+@router.post(
+    "/summaries/{summary_id}/generate-voice",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"audio/mpeg": {}}}},
+)
 async def generate_summary_voice(
     summary_id: str,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     """
     Generate TTS audio for a summary.
     Ensures user owns the summary before generating voice.
+    
+    Audio is streamed back as edge-tts produces it, so playback can start
+    before synthesis finishes and nothing is written to disk.
     """
     try:
         from tools.google_tts import GoogleTTS
         
+        if not ObjectId.is_valid(summary_id):
+            raise HTTPException(status_code=404, detail="Summary not found or access denied")
+        summary_oid = ObjectId(summary_id)
+        
         repository = get_manuscript_repository()
         
         # Verify ownership - security check
-        manuscript = repository.collection.find_one({
-            "_id": ObjectId(summary_id),
-            "user_id": current_user["id"]  # Must match logged-in user
-        })
+        manuscript = await repository.collection.find_one(
+            {
+                "_id": summary_oid,
+                "user_id": current_user["id"]  # Must match logged-in user
+            },
+            projection={"summary": 1}
+        )
         
         if not manuscript:
             raise HTTPException(status_code=404, detail="Summary not found or access denied")
@@ -494,39 +573,24 @@ async def generate_summary_voice(
         if not summary_text:
             raise HTTPException(status_code=400, detail="No summary available")
         
-        # Generate voice using edge-tts
-        logger.info(f"🔊 Generating voice for summary {summary_id}")
+        logger.info(f"🔊 Streaming voice for summary {summary_id}")
         tts = GoogleTTS()
-        audio_path = tts.synthesize_speech(
-            text=summary_text,
-            character_name=f"summary_{summary_id}",
-            voice_profile=None  # Use default voice
-        )
         
-        # Store voice metadata
-        repository.collection.update_one(
-            {"_id": ObjectId(summary_id)},
+        # Store voice metadata once the stream has been sent
+        background_tasks.add_task(
+            repository.set_voice_meta,
+            summary_oid,
             {
-                "$set": {
-                    "voice_meta": {
-                        "audio_path": audio_path,
-                        "voice_id": "en-US-AriaNeural",
-                        "language": "en-US",
-                        "duration": 0.0
-                    }
-                }
+                "voice_id": SUMMARY_VOICE_ID,
+                "language": "en-US",
+                "duration": 0.0
             }
         )
         
-        # Return relative URL for frontend
-        audio_filename = Path(audio_path).name
-        audio_url = f"/audio/{audio_filename}"
-        
-        logger.info(f"✅ Voice generated: {audio_url}")
-        return VoiceResponse(
-            audio_url=audio_url,
-            duration=0.0,
-            voice_id="en-US-AriaNeural"
+        return StreamingResponse(
+            tts.stream_speech(text=summary_text, voice_profile=None),  # Use default voice
+            media_type="audio/mpeg",
+            headers={"Content-Disposition": f'inline; filename="summary_{summary_id}.mp3"'},
         )
     except HTTPException:
         raise
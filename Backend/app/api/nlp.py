@@ -2,19 +2,102 @@
 API routes for NLP Extraction Engine
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
+import hashlib
+import json
 import logging
+import time
 
-from app.services.nlp import EntityExtractor
+import orjson
+import redis
+
+from app.db.redis_client import get_async_redis, get_redis
+from app.services.knowledge_graph.graph_manager import graph_db
+from app.services.nlp import EntityExtractor, Microbatcher
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/nlp", tags=["NLP Extraction"])
+router = APIRouter(
+    prefix="/api/v1/nlp",
+    tags=["NLP Extraction"],
+    default_response_class=ORJSONResponse,
+)
 
-# Initialize entity extractor (singleton)
+# Initialize entity extractor (singleton); concurrent requests share LLM calls
 entity_extractor = EntityExtractor()
+entity_batcher = Microbatcher(entity_extractor)
+
+EXTRACTION_MODEL = "llama-3.1-8b-instant"
+
+# Extraction results are cached per (text, context) so re-extracting an
+# unchanged paragraph during editing skips the LLM entirely
+EXTRACT_CACHE_TTL = 86400
+
+
+def _extract_cache_key(text: str, context: List[str]) -> str:
+    digest = hashlib.blake2b(
+        (text + "\x00" + "\x00".join(context)).encode(), digest_size=16
+    ).hexdigest()
+    return f"nlp:{EXTRACTION_MODEL}:{digest}"
+
+
+async def extract_cached(text: str, metadata: Dict[str, Any], context: List[str]) -> Dict[str, Any]:
+    """Entity extraction behind the Redis result cache; misses go through the batcher."""
+    key = _extract_cache_key(text, context)
+    try:
+        cached = await get_async_redis().get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+    except redis.RedisError as e:
+        logger.warning(f"⚠️ Extraction cache unavailable: {e}")
+    
+    extracted = await entity_batcher.submit(text=text, metadata=metadata, context=context)
+    
+    # An empty result is also what a failed LLM call returns; don't pin it
+    if any(extracted.get(k) for k in ("characters", "locations", "relationships")):
+        try:
+            await get_async_redis().set(key, orjson.dumps(extracted), ex=EXTRACT_CACHE_TTL)
+        except redis.RedisError:
+            pass
+    
+    return extracted
+
+
+# Graph writes run after the response; ones that still fail after retrying
+# are parked here so they can be inspected and replayed
+GRAPH_WRITE_ATTEMPTS = 3
+FAILED_WRITES_KEY = "nlp:failed_writes"
+
+
+def save_to_graph(extracted: Dict[str, Any], metadata: Dict[str, Any]):
+    """
+    Save extracted entities to Neo4j, retrying with backoff.
+    
+    Runs as a background task (in the threadpool), so the client never
+    waits on the commit. A write that fails every attempt is pushed to
+    the Redis dead-letter list instead of being lost.
+    """
+    for attempt in range(1, GRAPH_WRITE_ATTEMPTS + 1):
+        try:
+            graph_db.save_extracted_entities(extracted, metadata)
+            return
+        except Exception as e:
+            logger.warning(f"⚠️ Graph write attempt {attempt}/{GRAPH_WRITE_ATTEMPTS} failed: {e}")
+            if attempt < GRAPH_WRITE_ATTEMPTS:
+                time.sleep(0.5 * 2 ** (attempt - 1))
+    
+    try:
+        get_redis().rpush(FAILED_WRITES_KEY, json.dumps({
+            "entities": extracted,
+            "metadata": metadata,
+            "failed_at": time.time(),
+        }))
+        logger.error(f"❌ Graph write dead-lettered for manuscript: {metadata.get('manuscript_id')}")
+    except redis.RedisError as e:
+        logger.error(f"❌ Graph write lost for manuscript {metadata.get('manuscript_id')}: {e}")
 
 
 # Request/Response Models
@@ -64,7 +147,7 @@ class NLPExtractionResponse(BaseModel):
 
 # Endpoints
 @router.post("/extract", response_model=NLPExtractionResponse)
-async def extract_entities(request: NLPExtractionRequest):
+async def extract_entities(request: NLPExtractionRequest, background_tasks: BackgroundTasks):
     """
     Extract entities (characters, locations, relationships) from text.
     
@@ -91,7 +174,6 @@ async def extract_entities(request: NLPExtractionRequest):
     try:
         logger.info(f"NLP extraction request for manuscript: {request.manuscript_id}")
         
-        import time
         start_time = time.time()
         
         # Prepare metadata for entity extractor
@@ -102,7 +184,7 @@ async def extract_entities(request: NLPExtractionRequest):
         }
         
         # Extract entities
-        extracted = await entity_extractor.extract(
+        extracted = await extract_cached(
             text=request.text,
             metadata=metadata,
             context=request.context or []
@@ -118,12 +200,12 @@ async def extract_entities(request: NLPExtractionRequest):
         )
         
         # 🔥 CRITICAL: Save extracted entities to Neo4j Knowledge Graph
-        from app.services.knowledge_graph.graph_manager import graph_db
-        graph_db.save_extracted_entities(extracted, metadata)
+        # (after the response is sent; the response doesn't depend on it)
+        background_tasks.add_task(save_to_graph, extracted, metadata)
         
         response_metadata = {
             "processing_time_ms": processing_time_ms,
-            "model": "llama-3.1-8b-instant",
+            "model": EXTRACTION_MODEL,
             "manuscript_id": request.manuscript_id,
             "scene_id": request.scene_id,
             "character_count": len(entities.characters),
@@ -153,6 +235,6 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "nlp_extraction",
-        "model": "llama-3.1-8b-instant",
+        "model": EXTRACTION_MODEL,
         "provider": "groq"
     }
@@ -51,6 +51,9 @@ class Settings(BaseSettings):
     # Rate Limiting
     max_requests_per_minute: int = 60
     
+    # Request body cap (bytes); file uploads have their own, larger limit
+    max_request_bytes: int = 10 * 1024 * 1024
+    
     # Logging
     log_level: str = "INFO"
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -3,6 +3,8 @@ Manuscript Repository
 
 Handles all CRUD operations for manuscripts in MongoDB.
 Follows the Repository pattern to isolate data access logic.
+Uses the motor (asyncio) client, so every method is awaitable and
+request handlers never block the event loop on Mongo I/O.
 
 MongoDB Collection: manuscripts
 Document Schema:
@@ -13,21 +15,83 @@ Document Schema:
     summary: str,
     word_count: int,
     created_at: datetime (UTC),
+    created_at_iso: str (created_at pre-rendered as ISO 8601),
     model_used: str,
     file_type: str (optional - pdf, docx, txt),
     file_name: str (optional - original filename)
+    text_hash: str (optional - BLAKE2b of original_text, for de-duplication)
+}
+
+MongoDB Collection: voice_meta (expires after VOICE_META_TTL_SECONDS)
+Document Schema:
+{
+    summary_id: ObjectId (manuscript _id, unique),
+    voice_id: str,
+    language: str,
+    duration: float,
+    created_at: datetime (UTC)
 }
 """
 
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Union
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
+from pymongo.errors import OperationFailure
 import logging
 
-from app.db.mongodb import get_database
+from app.db.mongodb import get_async_database
 
 logger = logging.getLogger(__name__)
 
+# TTS metadata is ephemeral; Mongo's TTL monitor removes it after a week
+VOICE_META_TTL_SECONDS = 7 * 86400
+
+
+# Optional fields of a new manuscript document
+_DOCUMENT_DEFAULTS: Dict[str, Any] = {
+    "summary": "",
+    "word_count": 0,
+    "model_used": "",
+    "file_type": None,
+    "file_name": None,
+    "chapter": None,
+    "paragraph": None,
+    "user_id": None,
+    "text_hash": None,
+}
+
+
+# Metadata-only allow-list for listings; _id is included by default
+_LIST_PROJECTION = {
+    "title": 1,
+    "word_count": 1,
+    "created_at": 1,
+    "created_at_iso": 1,
+    "model_used": 1,
+    "file_type": 1,
+    "file_name": 1,
+}
+
+
+def _strip_id(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace a document's ObjectId _id with its string form under "id"."""
+    doc["id"] = str(doc.pop("_id"))
+    return doc
+
+
+@lru_cache(maxsize=8192)
+def _parse_oid(manuscript_id: str) -> ObjectId:
+    # Cached: clients polling the same id skip re-validating the hex string.
+    # Invalid ids raise, and exceptions are never cached.
+    return ObjectId(manuscript_id)
+
+
+def _oid(manuscript_id: Union[str, ObjectId]) -> ObjectId:
+    """Parse a string id; ObjectIds already parsed by the caller pass through."""
+    return manuscript_id if isinstance(manuscript_id, ObjectId) else _parse_oid(manuscript_id)
+
 
 class ManuscriptRepository:
     """
@@ -36,29 +100,96 @@ class ManuscriptRepository:
     """
     
     COLLECTION_NAME = "manuscripts"
+    VOICE_META_COLLECTION_NAME = "voice_meta"
+    # Marker documents for one-off data migrations, keyed by migration name
+    MIGRATIONS_COLLECTION_NAME = "migrations"
+    VOICE_META_MIGRATION = "unset_manuscript_voice_meta"
+    
+    # Non-empty summary; written as $gt (not $ne) so the planner can prove
+    # the partial index's filter and use it
+    SUMMARY_PRESENT = {"$gt": ""}
+    
+    # Fields the summary endpoints render; keeps original_text off the wire
+    SUMMARY_PROJECTION = {
+        "title": 1,
+        "summary": 1,
+        "created_at": 1,
+        "created_at_iso": 1,
+        "word_count": 1,
+        "chapter": 1,
+        "paragraph": 1,
+    }
     
     def __init__(self):
         """Initialize with database connection."""
-        self.db = get_database()
+        self.db = get_async_database()
         self.collection = self.db[self.COLLECTION_NAME]
-        self._ensure_indexes()
+        self.voice_meta = self.db[self.VOICE_META_COLLECTION_NAME]
+        self.migrations = self.db[self.MIGRATIONS_COLLECTION_NAME]
+        self._indexes_ensured = False
     
-    def _ensure_indexes(self):
-        """Create indexes for common query patterns."""
+    async def ensure_indexes(self):
+        """
+        Create indexes for common query patterns. Call this during application startup.
+        
+        Runs once per process; later calls return without touching the server.
+        """
+        if self._indexes_ensured:
+            return
         try:
             # Index on created_at for sorting by recency
-            self.collection.create_index("created_at", background=True)
-            # Text index on title for search
-            self.collection.create_index([("title", "text")], background=True)
+            await self.collection.create_index("created_at", background=True)
+            # Title search is per user, so the text index is prefixed with
+            # user_id: a search then examines one user's keys, not everyone's.
+            # (A text index can't serve the created_at sort, so that keeps
+            # its own index.)
+            # Only one text index is allowed per collection, so the old bare
+            # title index is dropped first on existing deployments
+            try:
+                await self.collection.drop_index("title_text")
+            except OperationFailure:
+                pass
+            await self.collection.create_index(
+                [("user_id", 1), ("title", "text")],
+                name="user_title_text",
+                background=True,
+            )
             # Index on user_id for user-scoped queries
-            self.collection.create_index("user_id", background=True)
+            await self.collection.create_index("user_id", background=True)
             # Compound index for user + recency
-            self.collection.create_index([("user_id", 1), ("created_at", -1)], background=True)
+            await self.collection.create_index([("user_id", 1), ("created_at", -1)], background=True)
+            # Partial twin covering only summarized manuscripts, for the
+            # user summary feeds; queries must use SUMMARY_PRESENT to match it
+            await self.collection.create_index(
+                [("user_id", 1), ("created_at", -1)],
+                partialFilterExpression={"summary": {"$gt": ""}},
+                name="user_nonempty_summary_created",
+                background=True,
+            )
+            # Voice metadata lives in its own TTL collection
+            await self.voice_meta.create_index("summary_id", unique=True, background=True)
+            await self.voice_meta.create_index(
+                "created_at", expireAfterSeconds=VOICE_META_TTL_SECONDS, background=True
+            )
+            # Drop voice_meta subdocuments written into manuscripts before
+            # it moved out. No index covers this scan, so a marker document
+            # makes it run once per deployment instead of on every boot.
+            if await self.migrations.find_one({"_id": self.VOICE_META_MIGRATION}) is None:
+                await self.collection.update_many(
+                    {"voice_meta": {"$exists": True}},
+                    {"$unset": {"voice_meta": ""}}
+                )
+                await self.migrations.update_one(
+                    {"_id": self.VOICE_META_MIGRATION},
+                    {"$set": {"applied_at": datetime.now(timezone.utc)}},
+                    upsert=True
+                )
+            self._indexes_ensured = True
             logger.debug("Manuscript indexes ensured")
         except Exception as e:
             logger.warning(f"Index creation warning: {e}")
     
-    def create(
+    async def create(
         self,
         title: str,
         original_text: str,
@@ -69,7 +200,8 @@ class ManuscriptRepository:
         file_name: Optional[str] = None,
         chapter: Optional[int] = None,
         paragraph: Optional[int] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        text_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Create a new manuscript document.
@@ -84,125 +216,170 @@ class ManuscriptRepository:
             file_name: Original filename
             chapter: Chapter number (optional)
             paragraph: Paragraph number (optional)
+            user_id: Owning user (optional)
+            text_hash: Content hash of original_text (optional)
             
         Returns:
             Created document with string ID
         """
-        now = datetime.now(timezone.utc)
-        document = {
+        documents = await self.create_many([{
             "title": title,
             "original_text": original_text,
             "summary": summary,
             "word_count": word_count,
-            "created_at": now,
-            "updated_at": now,
             "model_used": model_used,
             "file_type": file_type,
             "file_name": file_name,
             "chapter": chapter,
             "paragraph": paragraph,
             "user_id": user_id,
-        }
+            "text_hash": text_hash,
+        }])
+        return documents[0]
+    
+    async def create_many(self, manuscripts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create several manuscript documents in one round-trip.
         
-        try:
-            result = self.collection.insert_one(document)
-            document["id"] = str(result.inserted_id)
-            if "_id" in document:
-                del document["_id"]
-            
-            logger.info(f"📝 Manuscript created: {title} (ID: {document['id']})")
-            return document
+        Args:
+            manuscripts: Field dicts taking the same keys as create();
+                title and original_text are required
             
+        Returns:
+            Created documents with string IDs, in input order
+        """
+        if not manuscripts:
+            return []
+        
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+        documents = [
+            {
+                **_DOCUMENT_DEFAULTS,
+                **fields,
+                "created_at": now,
+                "created_at_iso": now_iso,
+                "updated_at": now,
+            }
+            for fields in manuscripts
+        ]
+        
+        try:
+            # ordered=False lets the server apply the batch without stopping
+            # at the first failure
+            result = await self.collection.insert_many(documents, ordered=False)
         except Exception as e:
-            logger.error(f"Failed to create manuscript: {e}")
+            logger.error(f"Failed to create manuscripts: {e}")
             raise
+        
+        for document, inserted_id in zip(documents, result.inserted_ids):
+            document["id"] = str(inserted_id)
+            document.pop("_id", None)
+            logger.info(f"📝 Manuscript created: {document['title']} (ID: {document['id']})")
+        
+        return documents
     
-    def get_by_id(self, manuscript_id: str) -> Optional[Dict[str, Any]]:
+    async def get_by_id(
+        self,
+        manuscript_id: Union[str, ObjectId],
+        fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Retrieve a manuscript by its ID.
         
         Args:
-            manuscript_id: String representation of MongoDB ObjectId
+            manuscript_id: MongoDB ObjectId, or its string form
+            fields: Only return these fields (plus id); all fields if None.
+                Leaving out original_text keeps metadata lookups light.
             
         Returns:
             Manuscript document or None if not found
         """
+        projection = None if fields is None else {field: 1 for field in fields}
         try:
-            doc = self.collection.find_one({"_id": ObjectId(manuscript_id)})
+            doc = await self.collection.find_one({"_id": _oid(manuscript_id)}, projection)
             if doc:
-                doc["id"] = str(doc["_id"])
-                del doc["_id"]
-                return doc
+                return _strip_id(doc)
             return None
         except Exception as e:
             logger.error(f"Failed to get manuscript {manuscript_id}: {e}")
             return None
     
-    def list_all(
+    async def list_all(
         self,
         limit: int = 50,
         offset: int = 0,
-        include_text: bool = False
-    ) -> List[Dict[str, Any]]:
+        include_text: bool = False,
+        include_summary: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
-        List manuscripts with pagination.
+        List manuscripts with pagination, plus the total count.
+        
+        The listing is unfiltered, so the total comes from collection
+        metadata (estimated_document_count) instead of counting every
+        document on each page fetch.
         
         Args:
             limit: Maximum number of results (default 50)
             offset: Number of documents to skip
             include_text: Whether to include full original_text (heavy)
+            include_summary: Whether to include the summary (often several KB)
             
         Returns:
-            List of manuscript documents
+            (list of manuscript documents, total manuscript count)
         """
         try:
-            # Projection to exclude heavy fields by default
-            projection = None
-            if not include_text:
-                projection = {"original_text": 0}
-            
-            cursor = (
-                self.collection
-                .find({}, projection)
-                .sort("created_at", -1)  # Most recent first
-                .skip(offset)
-                .limit(limit)
+            projection = _LIST_PROJECTION
+            if include_text or include_summary:
+                projection = {
+                    **_LIST_PROJECTION,
+                    **({"original_text": 1} if include_text else {}),
+                    **({"summary": 1} if include_summary else {}),
+                }
+            cursor = self.collection.find(
+                {},
+                projection=projection,
+                sort=[("created_at", -1)],  # Most recent first
+                skip=offset,
+                limit=limit,
+                # The whole page in one reply, with no getMore round-trips
+                batch_size=limit,
             )
             
-            results = []
-            for doc in cursor:
-                doc["id"] = str(doc["_id"])
-                del doc["_id"]
-                results.append(doc)
-            
-            return results
+            results = [_strip_id(doc) async for doc in cursor]
+            return results, await self.count()
             
         except Exception as e:
             logger.error(f"Failed to list manuscripts: {e}")
-            return []
+            return [], 0
     
-    def count(self) -> int:
-        """Get total count of manuscripts."""
+    async def count(self) -> int:
+        """
+        Get total count of manuscripts.
+        
+        Read from collection metadata (O(1)) rather than counting documents;
+        an approximate total is fine for pagination.
+        """
         try:
-            return self.collection.count_documents({})
+            return await self.collection.estimated_document_count()
         except Exception as e:
             logger.error(f"Failed to count manuscripts: {e}")
             return 0
     
-    def update_summary(self, manuscript_id: str, summary: str) -> bool:
+    async def update_summary(self, manuscript_id: Union[str, ObjectId], summary: str) -> bool:
         """
         Update the summary of an existing manuscript.
         
         Args:
-            manuscript_id: String representation of MongoDB ObjectId
+            manuscript_id: MongoDB ObjectId, or its string form
             summary: AI-generated summary to store
             
         Returns:
             True if updated successfully, False otherwise
         """
         try:
-            result = self.collection.update_one(
-                {"_id": ObjectId(manuscript_id)},
+            result = await self.collection.update_one(
+                {"_id": _oid(manuscript_id)},
                 {
                     "$set": {
                         "summary": summary,
@@ -218,34 +395,59 @@ class ManuscriptRepository:
             logger.error(f"Failed to update summary for {manuscript_id}: {e}")
             return False
     
-    def delete(self, manuscript_id: str) -> bool:
+    async def set_voice_meta(self, manuscript_id: Union[str, ObjectId], voice_meta: Dict[str, Any]):
+        """
+        Record the TTS voice generated for a manuscript's summary.
+        
+        Stored in the voice_meta collection rather than on the manuscript,
+        so it expires on its own and the manuscripts stay lean.
+        
+        Args:
+            manuscript_id: MongoDB ObjectId, or its string form
+            voice_meta: Voice id, language and duration
+        """
+        summary_id = _oid(manuscript_id)
+        await self.voice_meta.update_one(
+            {"summary_id": summary_id},
+            {
+                "$set": {
+                    **voice_meta,
+                    "summary_id": summary_id,
+                    "created_at": datetime.now(timezone.utc),
+                }
+            },
+            upsert=True
+        )
+    
+    async def delete(self, manuscript_id: Union[str, ObjectId]) -> bool:
         """
         Delete a manuscript by ID.
         
         Args:
-            manuscript_id: String representation of MongoDB ObjectId
+            manuscript_id: MongoDB ObjectId, or its string form
             
         Returns:
-            True if deleted, False otherwise
+            True if deleted, False if no such manuscript (or invalid ID)
+            
+        Raises:
+            Exception: If the delete itself fails
         """
         try:
-            result = self.collection.delete_one({"_id": ObjectId(manuscript_id)})
-            if result.deleted_count > 0:
-                logger.info(f"🗑️ Manuscript deleted: {manuscript_id}")
-                return True
+            result = await self.collection.delete_one({"_id": _oid(manuscript_id)})
+        except InvalidId:
             return False
         except Exception as e:
             logger.error(f"Failed to delete manuscript {manuscript_id}: {e}")
-            return False
-
-
-# Singleton instance for easy import
-_repository: Optional[ManuscriptRepository] = None
+            raise
+        
+        if result.deleted_count > 0:
+            logger.info(f"🗑️ Manuscript deleted: {manuscript_id}")
+            return True
+        return False
 
 
+# Singleton instance for easy import; lru_cache makes creation race-free
+@lru_cache(maxsize=None)
 def get_manuscript_repository() -> ManuscriptRepository:
     """Get or create the manuscript repository instance."""
-    global _repository
-    if _repository is None:
-        _repository = ManuscriptRepository()
-    return _repository
+    return ManuscriptRepository()
@@ -8,8 +8,12 @@ Design Decision:
 - We use a module-level client to avoid connection overhead per request.
 - The client is initialized lazily on first access.
 - Connection pooling is handled automatically by pymongo.
+- Async request handlers use the motor client (get_async_database) so
+  queries await instead of blocking the event loop; motor wraps pymongo,
+  so BSON decoding still runs in its C extension.
 """
 
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo import MongoClient
 from pymongo.database import Database
 from typing import Optional
@@ -18,9 +22,19 @@ import os
 
 logger = logging.getLogger(__name__)
 
+# Wire compression, negotiated with the server in order of preference.
+# Manuscript prose compresses several-fold; zstd (pymongo[zstd]) is fast,
+# zlib is the always-available fallback.
+COMPRESSION_OPTIONS = {
+    "compressors": "zstd,zlib",
+    "zlibCompressionLevel": 3,
+}
+
 # Module-level client (singleton pattern)
 _client: Optional[MongoClient] = None
 _database: Optional[Database] = None
+_async_client: Optional[AsyncIOMotorClient] = None
+_async_database: Optional[AsyncIOMotorDatabase] = None
 
 
 def get_client() -> MongoClient:
@@ -40,6 +54,7 @@ def get_client() -> MongoClient:
                 minPoolSize=10,          # Minimum connections to maintain
                 serverSelectionTimeoutMS=5000,  # 5 second timeout
                 connectTimeoutMS=5000,
+                **COMPRESSION_OPTIONS,
             )
             # Verify connection works
             _client.admin.command('ping')
@@ -67,18 +82,60 @@ def get_database() -> Database:
     return _database
 
 
+def get_async_client() -> AsyncIOMotorClient:
+    """
+    Get or create the motor (asyncio) MongoDB client.
+    Connects lazily on first operation.
+    """
+    global _async_client
+    
+    if _async_client is None:
+        mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+        _async_client = AsyncIOMotorClient(
+            mongodb_url,
+            maxPoolSize=200,        # Shared by manuscripts and users
+            minPoolSize=10,
+            serverSelectionTimeoutMS=5000,
+            connectTimeoutMS=5000,
+            **COMPRESSION_OPTIONS,
+        )
+        logger.info(f"✅ Async MongoDB client configured: {mongodb_url}")
+    
+    return _async_client
+
+
+def get_async_database() -> AsyncIOMotorDatabase:
+    """
+    Get the application database through the motor client.
+    Use this from async request handlers.
+    """
+    global _async_database
+    
+    if _async_database is None:
+        db_name = os.getenv("MONGODB_DB_NAME", "nolan_db")
+        _async_database = get_async_client()[db_name]
+    
+    return _async_database
+
+
 def close_connection():
     """
-    Close the MongoDB connection.
+    Close the MongoDB connections (sync and async).
     Call this during application shutdown.
     """
-    global _client, _database
+    global _client, _database, _async_client, _async_database
     
     if _client is not None:
         _client.close()
         _client = None
         _database = None
         logger.info("🔌 MongoDB connection closed")
+    
+    if _async_client is not None:
+        _async_client.close()
+        _async_client = None
+        _async_database = None
+        logger.info("🔌 Async MongoDB connection closed")
 
 
 # Health check utility
@@ -0,0 +1,91 @@
+"""
+Redis Connection Manager
+
+Provides a shared Redis client for caches and short-lived state.
+Follows the same lazy module-level singleton approach as mongodb.py.
+
+Design Decision:
+- Redis is treated as an accelerator, not a source of truth. Callers
+  should catch redis.RedisError and fall back to the uncached path.
+  Auth sessions are the one exception: Redis is their only store, so
+  app/api/auth.py maps redis.RedisError to a 503 instead.
+- Short socket timeouts keep a missing Redis from stalling requests.
+"""
+
+from typing import Optional
+import logging
+import os
+
+import redis
+from redis import asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Module-level clients (singleton pattern)
+_client: Optional[redis.Redis] = None
+_async_client: Optional[aioredis.Redis] = None
+
+
+def _connection_kwargs() -> dict:
+    return {
+        "db": int(os.getenv("REDIS_DB", "0")),
+        "decode_responses": True,
+        "socket_connect_timeout": 2,
+        "socket_timeout": 2,
+    }
+
+
+def get_redis() -> redis.Redis:
+    """
+    Get or create the Redis client.
+    Connection pooling is handled internally by redis-py.
+    """
+    global _client
+
+    if _client is None:
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+        _client = redis.Redis.from_url(redis_url, **_connection_kwargs())
+        logger.info(f"🧠 Redis client configured: {redis_url}")
+
+    return _client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """
+    Get or create the asyncio Redis client.
+    Use this from async request handlers so Redis I/O never blocks the loop.
+    """
+    global _async_client
+
+    if _async_client is None:
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+        _async_client = aioredis.Redis.from_url(redis_url, **_connection_kwargs())
+        logger.info(f"🧠 Async Redis client configured: {redis_url}")
+
+    return _async_client
+
+
+def close_connection():
+    """
+    Close the Redis connection pool.
+    Call this during application shutdown.
+    """
+    global _client
+
+    if _client is not None:
+        _client.close()
+        _client = None
+        logger.info("🔌 Redis connection closed")
+
+
+async def close_async_connection():
+    """
+    Close the asyncio Redis connection pool.
+    Call this during application shutdown.
+    """
+    global _async_client
+
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+        logger.info("🔌 Async Redis connection closed")
@@ -1,60 +1,79 @@
 """
 MongoDB User Database Operations
+
+Uses the shared motor (asyncio) client from mongodb.py, so auth handlers
+await user lookups instead of blocking the event loop and reuse the same
+connection pool as the rest of the app.
 """
-from pymongo import MongoClient
+import asyncio
+import hmac
+import re
+
+import bcrypt
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo.errors import DuplicateKeyError
 from bson.objectid import ObjectId
 from typing import Optional
 from datetime import datetime
 import logging
 
+from app.db.mongodb import get_async_database
+
 logger = logging.getLogger(__name__)
 
+# bcrypt work factor for new password hashes
+BCRYPT_ROUNDS = 10
+# A well-formed bcrypt hash; anything else is a legacy plaintext password
+BCRYPT_HASH_PATTERN = re.compile(r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$")
+
 
 class MongoUserDB:
-    def __init__(self, mongodb_url: str, db_name: str):
-        """Initialize MongoDB connection."""
+    def __init__(self, database: Optional[AsyncIOMotorDatabase] = None):
+        """Initialize with the application database (connects lazily on first operation)."""
+        self.db = database if database is not None else get_async_database()
+        self.users_collection = self.db["users"]
+
+    async def ensure_indexes(self):
+        """Create the unique email index. Call this during application startup."""
         try:
-            self.client = MongoClient(mongodb_url)
-            self.db = self.client[db_name]
-            self.users_collection = self.db["users"]
-            
-            # Create unique index on email
-            self.users_collection.create_index("email", unique=True)
-            print(f"✅ Database connected: {db_name}")
+            await self.users_collection.create_index("email", unique=True)
             logger.info("✅ MongoDB User DB Connected")
         except Exception as e:
-            print(f"❌ Database connection failed: {e}")
             logger.error(f"❌ MongoDB Connection Failed: {e}")
             raise
 
-    def create_user(self, email: str, name: str, password: str) -> dict:
+    async def create_user(self, email: str, name: str, password: str) -> dict:
         """Create a new user."""
         user_doc = {
             "email": email,
             "name": name,
-            "password": password,  # Plain password (for hackathon only!)
+            "password": await self._hash_password(password),
             "created_at": datetime.utcnow(),
         }
         try:
-            result = self.users_collection.insert_one(user_doc)
+            result = await self.users_collection.insert_one(user_doc)
             user_doc["id"] = str(result.inserted_id)
             return user_doc
         except DuplicateKeyError:
             raise ValueError(f"User with email {email} already exists")
 
-    def get_user_by_email(self, email: str) -> Optional[dict]:
+    async def delete_user(self, user_id: str) -> bool:
+        """Delete a user by ID. Returns True if it existed."""
+        result = await self.users_collection.delete_one({"_id": ObjectId(user_id)})
+        return result.deleted_count == 1
+
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
         """Get user by email."""
-        user = self.users_collection.find_one({"email": email})
+        user = await self.users_collection.find_one({"email": email})
         if user:
             user["id"] = str(user["_id"])
             return user
         return None
 
-    def get_user_by_id(self, user_id: str) -> Optional[dict]:
+    async def get_user_by_id(self, user_id: str) -> Optional[dict]:
         """Get user by ID."""
         try:
-            user = self.users_collection.find_one({"_id": ObjectId(user_id)})
+            user = await self.users_collection.find_one({"_id": ObjectId(user_id)})
             if user:
                 user["id"] = str(user["_id"])
                 return user
@@ -62,12 +81,40 @@ class MongoUserDB:
         except Exception:
             return None
 
+    async def _hash_password(self, password: str) -> str:
+        # Hashed off the event loop; bcrypt is deliberately slow
+        password_hash = await asyncio.to_thread(
+            bcrypt.hashpw, password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        )
+        return password_hash.decode()
+
+    async def set_password(self, user_id: str, password: str) -> bool:
+        """Store a bcrypt hash of password for the user. Returns True if updated."""
+        result = await self.users_collection.update_one(
+            {"_id": ObjectId(user_id)},
+            {"$set": {"password": await self._hash_password(password)}}
+        )
+        return result.modified_count == 1
+
+    def needs_rehash(self, stored_password: str) -> bool:
+        """True if the stored password is legacy plaintext rather than a bcrypt hash."""
+        return not BCRYPT_HASH_PATTERN.match(stored_password)
+
     def verify_password(self, stored_password: str, provided_password: str) -> bool:
-        """Verify password (simple comparison for hackathon)."""
-        return stored_password == provided_password
+        """
+        Verify a password against its stored form.
+        
+        bcrypt hashes are checked with bcrypt; accounts created before
+        hashing still hold plaintext, compared in constant time. Callers
+        should replace a matching plaintext password via set_password.
+        """
+        if not self.needs_rehash(stored_password):
+            try:
+                return bcrypt.checkpw(provided_password.encode(), stored_password.encode())
+            except ValueError:
+                # Plaintext that merely looks like a hash
+                pass
+        return hmac.compare_digest(stored_password.encode(), provided_password.encode())
 
     def close(self):
-        """Close MongoDB connection."""
-        if self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed")
+        """No-op: the shared client is closed by mongodb.close_connection()."""
@@ -1,13 +1,64 @@
+import hashlib
 import logging
+from typing import Optional
+
+import redis
+from cachetools import TTLCache
+
 from app.services.creative_assistant.grok_integration import GrokIntegration
+from app.db.redis_client import get_async_redis
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Suggestions for an identical tail are replayed from Redis
+SUGGESTION_CACHE_TTL = 300
+
+# In-process tier in front of Redis: a pause or backspace replays the last
+# suggestion without even a Redis round-trip
+_local_suggestions: TTLCache = TTLCache(maxsize=4096, ttl=60)
+
+# A suggestion that appears in this many trailing context characters is
+# treated as an echo of the input
+REPEAT_CHECK_CHARS = 64
+
+# A context that extends a cached one by fewer than this many characters can
+# reuse the rest of that suggestion if the user typed its beginning
+PREFIX_REUSE_CHARS = 3
+
+# Kept byte-identical across requests so the provider can reuse its prompt cache;
+# per-request values (like max_words) go in the user message instead.
+SYSTEM_PROMPT = (
+    "You are a super-fast autocomplete engine. "
+    "Your task is to complete the user's sentence naturally. "
+    "Output ONLY the completion, no longer than the word limit given. "
+    "Do not repeat the input. Do not output anything else. "
+    "If the sentence is complete or no obvious completion exists, output nothing."
+)
+
+
+def _digest(context: str) -> bytes:
+    return hashlib.blake2b(context.encode(), digest_size=16).digest()
+
+
 class AutocompleteService:
+    DEFAULT_MAX_WORDS = 5
+
     def __init__(self):
         # Use existing GrokIntegration which handles Groq/xAI logic
         self.ai = GrokIntegration(api_key=settings.xai_api_key)
+        # Nearly every request uses the default word limit; build its
+        # per-request strings once instead of on every keystroke
+        self._default_word_limit = self._word_limit_header(self.DEFAULT_MAX_WORDS)
+        self._default_cache_prefix = self._cache_prefix(self.DEFAULT_MAX_WORDS)
+
+    @staticmethod
+    def _word_limit_header(max_words: int) -> str:
+        return f"Word limit: {max_words}\n\n"
+
+    @staticmethod
+    def _cache_prefix(max_words: int) -> str:
+        return f"autocomplete:{max_words}:"
     
     async def predict_next_text(self, text: str, max_words: int = 5) -> str:
         """
@@ -18,21 +69,67 @@ class AutocompleteService:
 
         # Limit context to last 200 chars to cover the immediate sentence flow
         context = text[-200:]
-        
-        system_prompt = (
-            "You are a super-fast autocomplete engine. "
-            "Your task is to complete the user's sentence naturally. "
-            f"Output ONLY the completion, maximum {max_words} words. "
-            "Do not repeat the input. Do not output anything else. "
-            "If the sentence is complete or no obvious completion exists, output nothing."
+
+        local_key = (max_words, _digest(context))
+        cached = _local_suggestions.get(local_key)
+        if cached is not None:
+            return cached
+
+        # The user typed the first characters of a suggestion we just made.
+        # Suggestions are stored stripped, so the space that starts a new
+        # word (" t" against "the door") is not part of the match.
+        for typed in range(1, PREFIX_REUSE_CHARS):
+            previous = _local_suggestions.get((max_words, _digest(text[:-typed][-200:])))
+            if not previous:
+                continue
+            typed_text = text[-typed:].lstrip()
+            if len(previous) > len(typed_text) and previous.startswith(typed_text):
+                return previous[len(typed_text):]
+
+        prefix = (
+            self._default_cache_prefix if max_words == self.DEFAULT_MAX_WORDS
+            else self._cache_prefix(max_words)
         )
+        cache_key = prefix + hashlib.sha256(context.encode()).hexdigest()
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
+            _local_suggestions[local_key] = cached
+            return cached
+
+        suggestion = await self._complete(context, max_words)
+        if suggestion is None:
+            # Provider error: don't cache, the next keystroke should retry
+            return ""
+
+        _local_suggestions[local_key] = suggestion
+        await self._set_cached(cache_key, suggestion)
+        return suggestion
 
+    async def _get_cached(self, key: str) -> Optional[str]:
+        try:
+            return await get_async_redis().get(key)
+        except redis.RedisError as e:
+            logger.debug(f"Autocomplete cache unavailable: {e}")
+            return None
+
+    async def _set_cached(self, key: str, suggestion: str):
+        try:
+            await get_async_redis().setex(key, SUGGESTION_CACHE_TTL, suggestion)
+        except redis.RedisError:
+            pass
+
+    async def _complete(self, context: str, max_words: int) -> Optional[str]:
+        """Ask the model for a completion of context; None if the call failed."""
+        header = (
+            self._default_word_limit if max_words == self.DEFAULT_MAX_WORDS
+            else self._word_limit_header(max_words)
+        )
         try:
             # Call generate_reasoning with json_mode=False to get raw text
             # Increased token limit to ensure complete responses
             result = await self.ai.generate_reasoning(
-                system_prompt=system_prompt,
-                user_prompt=context,
+                system_prompt=SYSTEM_PROMPT,
+                user_prompt=header + context,
                 temperature=0.1,
                 max_tokens=50,
                 json_mode=False
@@ -40,14 +137,15 @@ class AutocompleteService:
             
             completion = result.get("text", "").strip()
             
-            # Sanity check: ensure it doesn't just repeat the input words
-            if completion and completion.lower() not in context.lower():
+            # Sanity check: ensure it doesn't just repeat the input words.
+            # An echo repeats the text just typed, so only the tail is searched
+            if completion and completion.casefold() not in context[-REPEAT_CHECK_CHARS:].casefold():
                 return completion
             
             return ""
 
         except Exception as e:
             logger.warning(f"Autocomplete failed: {e}")
-            return ""
+            return None
 
 autocomplete_service = AutocompleteService()
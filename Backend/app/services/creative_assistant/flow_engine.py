@@ -3,12 +3,14 @@ Production-Grade Flow Engine for Long Documents
 Improves readability and flow while preserving content 100%
 """
 
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import asyncio
 import logging
 import re
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from app.config import settings
+from app.services.creative_assistant.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -131,6 +133,102 @@ GUARANTEES
 ✔ Free-tier compatible"""
 
 
+TONE_INSTRUCTIONS = {
+    "default": "Clear, professional, smooth, readable",
+    "academic": "Formal academic style with precise language and scholarly tone",
+    "business": "Professional business style, concise and executive-friendly",
+    "simple": "Plain language for easy understanding, accessible to all readers",
+    "creative": "Light creative flair while maintaining professionalism (subtle only)"
+}
+
+
+# Meta commentary the model sometimes prepends, stripped from every chunk
+META_COMMENTARY_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r'^\s*(?:Here is|Here\'s|Below is)\s+(?:the\s+)?(?:improved|rewritten|edited)\s+(?:version|text|document).*?:\s*',
+        r'^\s*\*\*(?:Improved|Rewritten|Edited)\s+(?:Version|Text|Document)\*\*:?\s*',
+        r'^\s*Improved\s+(?:Version|Text|Document):?\s*',
+    )
+]
+
+SENTENCE_SPLIT_PATTERN = re.compile(r'([.!?]+\s+)')
+
+# Chunks of one document sent to the provider at the same time
+MAX_CONCURRENT_CHUNKS = 4
+
+
+# One client per key/endpoint, shared by every FlowEngine so HTTP pools are reused
+_clients: Dict[Tuple[str, str], AsyncOpenAI] = {}
+
+
+def _get_client(api_key: str, base_url: str) -> AsyncOpenAI:
+    key = (api_key, base_url)
+    if key not in _clients:
+        _clients[key] = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=get_http_client())
+    return _clients[key]
+
+
+def _provider_config(api_key: str) -> Tuple[str, str, str, int]:
+    """Return (provider, base_url, model, max_chunk_size) for an API key."""
+    if api_key.startswith("xai-"):
+        # Larger context window
+        return "grok", "https://api.x.ai/v1", "grok-beta", 15000
+    # Groq keys (gsk_) and anything unrecognised; conservative for context window
+    return "groq", "https://api.groq.com/openai/v1", "llama-3.3-70b-versatile", 6000
+
+
+class _KeyRotation:
+    """
+    API key cursor for a single request.
+    
+    The engine is shared across concurrent requests, so the active key,
+    client and rate-limit bookkeeping live here instead of on the engine.
+    """
+    
+    def __init__(self, api_keys: List[str]):
+        self.api_keys = api_keys
+        self.index = 0
+        self.failed_keys = set()
+        self._select()
+    
+    def _select(self):
+        api_key = self.api_keys[self.index]
+        self.provider, base_url, self.model, _ = _provider_config(api_key)
+        self.client = _get_client(api_key, base_url)
+    
+    def rotate(self, failed_index: int) -> bool:
+        """
+        Mark failed_index as rate limited and move to the next available key.
+        Chunks of one request share this cursor, so if another chunk already
+        rotated away from failed_index the current key is kept.
+        Returns True if a usable key is selected, False if all keys failed.
+        """
+        self.failed_keys.add(failed_index)
+        if self.index != failed_index and self.index not in self.failed_keys:
+            return True
+        
+        for _ in range(len(self.api_keys)):
+            self.index = (self.index + 1) % len(self.api_keys)
+            
+            if self.index not in self.failed_keys:
+                logger.info(f"🔄 Rotating to API key {self.index + 1}/{len(self.api_keys)}")
+                self._select()
+                return True
+        
+        # All keys have failed
+        logger.error("❌ All API keys have hit rate limits")
+        return False
+
+
+async def close_clients():
+    """
+    Drop the cached clients. Call this during application shutdown; the
+    underlying pool is closed by close_http_client().
+    """
+    _clients.clear()
+
+
 class FlowEngine:
     """
     Production-grade flow improvement engine.
@@ -160,65 +258,10 @@ class FlowEngine:
         if not self.api_keys:
             raise ValueError("No API keys configured. Please set XAI_API_KEY in environment.")
         
-        self.current_key_index = 0
-        self.failed_keys = set()  # Track keys that have hit rate limits
-        
-        # Initialize with first available key
-        self._initialize_client(self.api_keys[self.current_key_index])
+        # Chunking follows the primary key; each request rotates keys on its own
+        self.provider, _, self.model, self.max_chunk_size = _provider_config(self.api_keys[0])
         
-        logger.info(f"Flow Engine initialized with {len(self.api_keys)} API key(s)")
-    
-    def _initialize_client(self, api_key: str):
-        """Initialize the OpenAI client with the given API key."""
-        # Detect API provider
-        if api_key.startswith("gsk_"):
-            self.provider = "groq"
-            self.client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.groq.com/openai/v1"
-            )
-            self.model = "llama-3.3-70b-versatile"
-            self.max_chunk_size = 6000  # Conservative for context window
-        elif api_key.startswith("xai-"):
-            self.provider = "grok"
-            self.client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.x.ai/v1"
-            )
-            self.model = "grok-beta"
-            self.max_chunk_size = 15000  # Larger context window
-        else:
-            # Default to Groq
-            self.provider = "groq"
-            self.client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.groq.com/openai/v1"
-            )
-            self.model = "llama-3.3-70b-versatile"
-            self.max_chunk_size = 6000
-        
-        logger.info(f"Using API key {self.current_key_index + 1}/{len(self.api_keys)}: {self.provider} - {self.model}")
-    
-    def _rotate_api_key(self) -> bool:
-        """
-        Rotate to the next available API key.
-        Returns True if rotation was successful, False if no more keys available.
-        """
-        # Mark current key as failed
-        self.failed_keys.add(self.current_key_index)
-        
-        # Try to find next available key
-        for _ in range(len(self.api_keys)):
-            self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-            
-            if self.current_key_index not in self.failed_keys:
-                logger.info(f"🔄 Rotating to API key {self.current_key_index + 1}/{len(self.api_keys)}")
-                self._initialize_client(self.api_keys[self.current_key_index])
-                return True
-        
-        # All keys have failed
-        logger.error("❌ All API keys have hit rate limits")
-        return False
+        logger.info(f"Flow Engine initialized with {len(self.api_keys)} API key(s): {self.provider} - {self.model}")
     
     def _chunk_document(self, content: str) -> List[Dict[str, Any]]:
         """
@@ -247,7 +290,7 @@ class FlowEngine:
                     current_size = 0
                 
                 # Split large paragraph by sentences
-                sentences = re.split(r'([.!?]+\s+)', para)
+                sentences = SENTENCE_SPLIT_PATTERN.split(para)
                 temp_chunk = []
                 temp_size = 0
                 
@@ -301,14 +344,7 @@ class FlowEngine:
     
     def _get_tone_instruction(self, tone: str) -> str:
         """Get tone-specific instruction."""
-        tone_map = {
-            "default": "Clear, professional, smooth, readable",
-            "academic": "Formal academic style with precise language and scholarly tone",
-            "business": "Professional business style, concise and executive-friendly",
-            "simple": "Plain language for easy understanding, accessible to all readers",
-            "creative": "Light creative flair while maintaining professionalism (subtle only)"
-        }
-        return tone_map.get(tone, tone_map["default"])
+        return TONE_INSTRUCTIONS.get(tone, TONE_INSTRUCTIONS["default"])
     
     async def improve_flow(
         self,
@@ -337,18 +373,11 @@ class FlowEngine:
         else:
             return await self._improve_flow_single(content, tone, preserve_formatting)
     
-    async def _improve_flow_single(
-        self,
-        content: str,
-        tone: str,
-        preserve_formatting: bool
-    ) -> Dict[str, Any]:
-        """Improve flow for single chunk with automatic API key rotation on rate limits."""
-        from openai import RateLimitError
-        
+    def _build_single_prompt(self, content: str, tone: str, preserve_formatting: bool) -> str:
+        """User prompt for a document that fits in one request."""
         tone_instruction = self._get_tone_instruction(tone)
         
-        user_prompt = f"""TONE CONTROL: {tone_instruction}
+        return f"""TONE CONTROL: {tone_instruction}
 
 FORMATTING: {'Strictly preserve all formatting, headings, lists, and structure' if preserve_formatting else 'Normalize formatting for better readability'}
 
@@ -357,13 +386,92 @@ DOCUMENT TO IMPROVE:
 {content}
 
 IMPROVED DOCUMENT (output only the improved text, no explanations):"""
+    
+    async def stream_improve_flow(
+        self,
+        content: str,
+        tone: str = "default",
+        preserve_formatting: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of improve_flow that yields text as it is produced.
+        
+        Short documents stream tokens straight from the model. Long documents
+        are still chunked and processed concurrently; each improved chunk is
+        yielded, in order, as soon as it and its predecessors are done.
+        Meta-commentary cleanup is only applied in the chunked path, since a
+        prefix can't be stripped from tokens that were already sent.
+        """
+        keys = _KeyRotation(self.api_keys)
+        
+        if len(content) > self.max_chunk_size:
+            chunks = self._chunk_document(content)
+            tone_instruction = self._get_tone_instruction(tone)
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+            
+            async def process(idx: int, chunk: Dict[str, Any]):
+                async with semaphore:
+                    return await self._improve_chunk(
+                        keys, idx, len(chunks), chunk['content'], tone_instruction, preserve_formatting
+                    )
+            
+            tasks = [asyncio.create_task(process(idx, chunk)) for idx, chunk in enumerate(chunks)]
+            try:
+                for idx, task in enumerate(tasks):
+                    text, _ = await task
+                    yield text if idx == 0 else '\n\n' + text
+            finally:
+                for task in tasks:
+                    task.cancel()
+            return
+        
+        from openai import RateLimitError
+        
+        user_prompt = self._build_single_prompt(content, tone, preserve_formatting)
+        
+        for attempt in range(len(self.api_keys)):
+            key_index = keys.index
+            try:
+                stream = await keys.client.chat.completions.create(
+                    model=keys.model,
+                    messages=[
+                        {"role": "system", "content": FLOW_ENGINE_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.5,
+                    max_tokens=8000,
+                    stream=True
+                )
+                break
+            except RateLimitError:
+                logger.warning(f"⚠️ Rate limit hit on API key {key_index + 1}/{len(self.api_keys)}")
+                if attempt == len(self.api_keys) - 1 or not keys.rotate(key_index):
+                    raise Exception("All API keys have hit rate limits. Please wait or add more keys.")
+        
+        async for event in stream:
+            delta = event.choices[0].delta.content if event.choices else None
+            if delta:
+                yield delta
+    
+    async def _improve_flow_single(
+        self,
+        content: str,
+        tone: str,
+        preserve_formatting: bool
+    ) -> Dict[str, Any]:
+        """Improve flow for single chunk with automatic API key rotation on rate limits."""
+        from openai import RateLimitError
+        
+        user_prompt = self._build_single_prompt(content, tone, preserve_formatting)
+        keys = _KeyRotation(self.api_keys)
         
         max_retries = len(self.api_keys)
         
         for attempt in range(max_retries):
+            key_index = keys.index
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
+                response = await keys.client.chat.completions.create(
+                    model=keys.model,
                     messages=[
                         {"role": "system", "content": FLOW_ENGINE_SYSTEM_PROMPT},
                         {"role": "user", "content": user_prompt}
@@ -384,18 +492,18 @@ IMPROVED DOCUMENT (output only the improved text, no explanations):"""
                     "chunks_processed": 1,
                     "total_chunks": 1,
                     "tokens_used": response.usage.total_tokens if response.usage else 0,
-                    "provider": self.provider,
-                    "model": self.model,
-                    "api_key_used": self.current_key_index + 1
+                    "provider": keys.provider,
+                    "model": keys.model,
+                    "api_key_used": key_index + 1
                 }
                 
             except RateLimitError as e:
-                logger.warning(f"⚠️ Rate limit hit on API key {self.current_key_index + 1}/{len(self.api_keys)}")
+                logger.warning(f"⚠️ Rate limit hit on API key {key_index + 1}/{len(self.api_keys)}")
                 
                 # Try to rotate to next key
                 if attempt < max_retries - 1:
-                    if self._rotate_api_key():
-                        logger.info(f"Retrying with API key {self.current_key_index + 1}...")
+                    if keys.rotate(key_index):
+                        logger.info(f"Retrying with API key {keys.index + 1}...")
                         continue
                     else:
                         # No more keys available
@@ -414,28 +522,66 @@ IMPROVED DOCUMENT (output only the improved text, no explanations):"""
         tone: str,
         preserve_formatting: bool
     ) -> Dict[str, Any]:
-        """Improve flow for large document with chunking and API key rotation."""
+        """
+        Improve flow for large document with chunking and API key rotation.
+        Chunks are independent requests, so they are processed concurrently
+        (bounded by MAX_CONCURRENT_CHUNKS) and reassembled in order.
+        """
+        chunks = self._chunk_document(content)
+        tone_instruction = self._get_tone_instruction(tone)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+        keys = _KeyRotation(self.api_keys)
+        
+        async def process(idx: int, chunk: Dict[str, Any]):
+            async with semaphore:
+                return await self._improve_chunk(
+                    keys, idx, len(chunks), chunk['content'], tone_instruction, preserve_formatting
+                )
+        
+        results = await asyncio.gather(*(process(idx, chunk) for idx, chunk in enumerate(chunks)))
+        
+        # Reassemble document
+        final_improved = '\n\n'.join(text for text, _ in results)
+        total_tokens = sum(tokens for _, tokens in results)
+        
+        return {
+            "original": content,
+            "improved": final_improved,
+            "tone": tone,
+            "chunks_processed": len(chunks),
+            "total_chunks": len(chunks),
+            "tokens_used": total_tokens,
+            "provider": keys.provider,
+            "model": keys.model,
+            "api_key_used": keys.index + 1
+        }
+    
+    async def _improve_chunk(
+        self,
+        keys: _KeyRotation,
+        idx: int,
+        total: int,
+        chunk_content: str,
+        tone_instruction: str,
+        preserve_formatting: bool
+    ) -> Tuple[str, int]:
+        """
+        Improve a single chunk, rotating the request's API keys on rate limits.
+        Returns (text, tokens_used); falls back to the original text on failure.
+        """
         from openai import RateLimitError
         
-        chunks = self._chunk_document(content)
-        improved_chunks = []
-        total_tokens = 0
+        logger.info(f"Processing chunk {idx + 1}/{total}")
         
-        tone_instruction = self._get_tone_instruction(tone)
+        # Add context about position in document
+        if idx == 0:
+            position_context = "This is the BEGINNING of a larger document."
+        elif idx == total - 1:
+            position_context = "This is the END of a larger document."
+        else:
+            position_context = f"This is PART {idx + 1} of {total} of a larger document."
         
-        for idx, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {idx + 1}/{len(chunks)}")
-            
-            # Add context about position in document
-            position_context = ""
-            if idx == 0:
-                position_context = "This is the BEGINNING of a larger document."
-            elif idx == len(chunks) - 1:
-                position_context = "This is the END of a larger document."
-            else:
-                position_context = f"This is PART {idx + 1} of {len(chunks)} of a larger document."
-            
-            user_prompt = f"""TONE CONTROL: {tone_instruction}
+        user_prompt = f"""TONE CONTROL: {tone_instruction}
 
 FORMATTING: {'Strictly preserve all formatting, headings, lists, and structure' if preserve_formatting else 'Normalize formatting for better readability'}
 
@@ -444,86 +590,58 @@ Maintain consistency with the overall document. Do not add introductions or conc
 
 DOCUMENT CHUNK TO IMPROVE:
 
-{chunk['content']}
+{chunk_content}
 
 IMPROVED CHUNK (output only the improved text, no explanations):"""
-            
-            # Retry with API key rotation
-            max_retries = len(self.api_keys)
-            chunk_processed = False
-            
-            for attempt in range(max_retries):
-                try:
-                    response = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=[
-                            {"role": "system", "content": FLOW_ENGINE_SYSTEM_PROMPT},
-                            {"role": "user", "content": user_prompt}
-                        ],
-                        temperature=0.5,
-                        max_tokens=8000
-                    )
-                    
-                    improved = response.choices[0].message.content.strip()
-                    improved = self._clean_output(improved)
-                    improved_chunks.append(improved)
-                    
-                    if response.usage:
-                        total_tokens += response.usage.total_tokens
-                    
-                    chunk_processed = True
-                    break  # Success, move to next chunk
-                    
-                except RateLimitError as e:
-                    logger.warning(f"⚠️ Rate limit hit on chunk {idx + 1}, API key {self.current_key_index + 1}/{len(self.api_keys)}")
-                    
-                    # Try to rotate to next key
-                    if attempt < max_retries - 1:
-                        if self._rotate_api_key():
-                            logger.info(f"Retrying chunk {idx + 1} with API key {self.current_key_index + 1}...")
-                            continue
-                        else:
-                            # No more keys available
-                            logger.error(f"All API keys exhausted on chunk {idx + 1}")
-                            break
+        
+        # Retry with API key rotation
+        max_retries = len(self.api_keys)
+        
+        for attempt in range(max_retries):
+            key_index = keys.index
+            try:
+                response = await keys.client.chat.completions.create(
+                    model=keys.model,
+                    messages=[
+                        {"role": "system", "content": FLOW_ENGINE_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.5,
+                    max_tokens=8000
+                )
+                
+                improved = response.choices[0].message.content.strip()
+                improved = self._clean_output(improved)
+                return improved, response.usage.total_tokens if response.usage else 0
+                
+            except RateLimitError as e:
+                logger.warning(f"⚠️ Rate limit hit on chunk {idx + 1}, API key {key_index + 1}/{len(self.api_keys)}")
+                
+                # Try to rotate to next key
+                if attempt < max_retries - 1:
+                    if keys.rotate(key_index):
+                        logger.info(f"Retrying chunk {idx + 1} with API key {keys.index + 1}...")
+                        continue
                     else:
-                        logger.error(f"Failed to process chunk {idx + 1} after all retries")
+                        # No more keys available
+                        logger.error(f"All API keys exhausted on chunk {idx + 1}")
                         break
-                        
-                except Exception as e:
-                    logger.error(f"Error processing chunk {idx + 1}: {e}", exc_info=True)
+                else:
+                    logger.error(f"Failed to process chunk {idx + 1} after all retries")
                     break
-            
-            # If chunk wasn't processed successfully, use original
-            if not chunk_processed:
-                logger.warning(f"Using original content for chunk {idx + 1}")
-                improved_chunks.append(chunk['content'])
-        
-        # Reassemble document
-        final_improved = '\n\n'.join(improved_chunks)
+                    
+            except Exception as e:
+                logger.error(f"Error processing chunk {idx + 1}: {e}", exc_info=True)
+                break
         
-        return {
-            "original": content,
-            "improved": final_improved,
-            "tone": tone,
-            "chunks_processed": len(chunks),
-            "total_chunks": len(chunks),
-            "tokens_used": total_tokens,
-            "provider": self.provider,
-            "model": self.model,
-            "api_key_used": self.current_key_index + 1
-        }
+        # If chunk wasn't processed successfully, use original
+        logger.warning(f"Using original content for chunk {idx + 1}")
+        return chunk_content, 0
     
     def _clean_output(self, text: str) -> str:
         """Remove any meta commentary from output."""
         # Remove common meta phrases
-        patterns = [
-            r'^\s*(?:Here is|Here\'s|Below is)\s+(?:the\s+)?(?:improved|rewritten|edited)\s+(?:version|text|document).*?:\s*',
-            r'^\s*\*\*(?:Improved|Rewritten|Edited)\s+(?:Version|Text|Document)\*\*:?\s*',
-            r'^\s*Improved\s+(?:Version|Text|Document):?\s*',
-        ]
-        
-        for pattern in patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.MULTILINE)
+        for pattern in META_COMMENTARY_PATTERNS:
+            text = pattern.sub('', text)
         
         return text.strip()
@@ -120,31 +120,35 @@ class PlotRiskAnalyzer:
     
     def __init__(self, api_key: Optional[str] = None):
         """Initialize the analyzer."""
-        from openai import OpenAI
+        from openai import AsyncOpenAI
         from app.config import settings
+        from app.services.creative_assistant.utils.http_client import get_http_client
         
         api_key = api_key or settings.xai_api_key
         
         # Use same API detection as FlowEngine
         if api_key.startswith("gsk_"):
             self.provider = "groq"
-            self.client = OpenAI(
+            self.client = AsyncOpenAI(
                 api_key=api_key,
-                base_url="https://api.groq.com/openai/v1"
+                base_url="https://api.groq.com/openai/v1",
+                http_client=get_http_client()
             )
             self.model = "llama-3.3-70b-versatile"
         elif api_key.startswith("xai-"):
             self.provider = "grok"
-            self.client = OpenAI(
+            self.client = AsyncOpenAI(
                 api_key=api_key,
-                base_url="https://api.x.ai/v1"
+                base_url="https://api.x.ai/v1",
+                http_client=get_http_client()
             )
             self.model = "grok-beta"
         else:
             self.provider = "groq"
-            self.client = OpenAI(
+            self.client = AsyncOpenAI(
                 api_key=api_key,
-                base_url="https://api.groq.com/openai/v1"
+                base_url="https://api.groq.com/openai/v1",
+                http_client=get_http_client()
             )
             self.model = "llama-3.3-70b-versatile"
         
@@ -187,7 +191,7 @@ Focus on problems that will emerge in later acts.
 Return a JSON object with your predictive analysis following the exact structure specified in your system prompt."""
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": PLOT_ANALYST_SYSTEM_PROMPT},
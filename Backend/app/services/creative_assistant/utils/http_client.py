@@ -0,0 +1,65 @@
+"""
+Shared HTTP client for LLM provider calls.
+
+Every AsyncOpenAI client in the creative assistant (rewrite, flow engine,
+plot risk analyzer) is built on this one httpx pool.
+
+Design Decision:
+- HTTP/2 multiplexes concurrent completions over a few connections
+  instead of opening one TCP/TLS connection per in-flight request.
+- Pool limits are raised above httpx's defaults so bursts of chunked
+  flow requests don't queue for a connection.
+"""
+
+from typing import Optional
+import logging
+import threading
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Module-level client (singleton pattern)
+_client: Optional[httpx.AsyncClient] = None
+# Engines are constructed concurrently in worker threads at startup
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the shared async HTTP client.
+    Pass it to AsyncOpenAI(http_client=...).
+    """
+    global _client
+
+    client = _client
+    if client is not None and not client.is_closed:
+        return client
+
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=200,
+                    max_connections=500,
+                    keepalive_expiry=30.0,
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            )
+            logger.info("🌐 LLM HTTP client configured (HTTP/2)")
+
+        return _client
+
+
+async def close_http_client():
+    """
+    Close the shared HTTP client.
+    Call this during application shutdown.
+    """
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("🔌 LLM HTTP client closed")
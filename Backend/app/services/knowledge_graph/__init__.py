@@ -2,6 +2,6 @@
 Knowledge Graph Service Package
 """
 
-from .graph_manager import GraphManager, graph_db
+from .graph_manager import GraphManager, driver_info, graph_db
 
-__all__ = ["GraphManager", "graph_db"]
+__all__ = ["GraphManager", "driver_info", "graph_db"]
@@ -1,12 +1,100 @@
 import os
-from neo4j import GraphDatabase
+from importlib import metadata
+
+import neo4j
+from neo4j import AsyncGraphDatabase, GraphDatabase
+
+
+def driver_info() -> str:
+    """Driver version and whether the Rust Bolt codec (neo4j-rust-ext) is installed."""
+    try:
+        codec = f"rust {metadata.version('neo4j-rust-ext')}"
+    except metadata.PackageNotFoundError:
+        codec = "pure Python"
+    return f"neo4j {neo4j.__version__}, {codec} codec"
+
 
 class GraphManager:
     def __init__(self):
         uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
         user = os.getenv("NEO4J_USER", "neo4j")
         password = os.getenv("NEO4J_PASSWORD", "password")
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        # One pool per driver for the app lifetime. A bounded pool with a finite
+        # acquisition timeout turns overload into a fast error instead of an
+        # unbounded queue behind the pool.
+        pool_options = {
+            "max_connection_pool_size": int(os.getenv("NEO4J_MAX_POOL_SIZE", "50")),
+            "connection_acquisition_timeout": float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30")),
+        }
+        self.driver = GraphDatabase.driver(uri, auth=(user, password), **pool_options)
+        # Read endpoints in async handlers use this so queries never block the event loop.
+        # fetch_size bounds how many records each pull buffers for streamed exports.
+        self.async_driver = AsyncGraphDatabase.driver(
+            uri, auth=(user, password), fetch_size=100, **pool_options
+        )
+
+        # Bumped on every write so read caches can key on it. In-process only;
+        # other workers see a write once their cache TTL lapses.
+        self._versions = {}
+
+    def version(self, manuscript_id: str = None) -> int:
+        """Write counter for a manuscript (or for all manuscripts when None)."""
+        return self._versions.get(manuscript_id, 0)
+
+    def _bump_version(self, manuscript_id: str):
+        self._versions[manuscript_id] = self._versions.get(manuscript_id, 0) + 1
+        self._versions[None] = self._versions.get(None, 0) + 1
+
+    async def start(self):
+        """Verify connectivity, create indexes and backfill. Call this during application startup."""
+        await self.async_driver.verify_connectivity()
+        await self.ensure_indexes()
+        await self.backfill_appearances()
+        await self.backfill_slugs()
+
+    async def close(self):
+        """Close both drivers. Call this during application shutdown."""
+        self.driver.close()
+        await self.async_driver.close()
+
+    async def ensure_indexes(self):
+        """
+        Index (manuscript_id, name) so keyset pagination on name is an index
+        seek, and slug so entities can be resolved from their API id.
+        """
+        async with self.async_driver.session() as session:
+            result = await session.run(
+                "CREATE INDEX entity_name_mid IF NOT EXISTS "
+                "FOR (n:NarrativeEntity) ON (n.manuscript_id, n.name)"
+            )
+            await result.consume()
+            result = await session.run(
+                "CREATE INDEX entity_slug IF NOT EXISTS "
+                "FOR (n:NarrativeEntity) ON (n.slug)"
+            )
+            await result.consume()
+
+    async def backfill_appearances(self):
+        """Denormalize first/last_appearance onto entities saved before those fields existed."""
+        async with self.async_driver.session() as session:
+            result = await session.run("""
+                MATCH (n:NarrativeEntity)-[:APPEARS_IN]->(s:Scene)
+                WHERE n.first_appearance IS NULL
+                WITH n, min(s.created_at) AS first_seen, max(s.created_at) AS last_seen
+                SET n.first_appearance = first_seen,
+                    n.last_appearance = last_seen
+            """)
+            await result.consume()
+
+    async def backfill_slugs(self):
+        """Set slug on entities saved before it was written at MERGE time."""
+        async with self.async_driver.session() as session:
+            result = await session.run("""
+                MATCH (n:NarrativeEntity)
+                WHERE n.slug IS NULL AND n.name IS NOT NULL
+                SET n.slug = toLower(replace(n.name, ' ', '_'))
+            """)
+            await result.consume()
 
     def save_extracted_entities(self, entities: dict, metadata: dict):
         """
@@ -16,6 +104,7 @@ class GraphManager:
         """
         with self.driver.session() as session:
             session.execute_write(self._save_transaction, entities, metadata)
+        self._bump_version(metadata.get("manuscript_id"))
 
     def _save_transaction(self, tx, entities, metadata):
         mid = metadata.get("manuscript_id")
@@ -23,25 +112,34 @@ class GraphManager:
         scene_id = f"{mid}_p{metadata.get('paragraph')}"
         
         # 1. SCENE NODE (The Anchor)
-        tx.run("""
+        scene_ts = tx.run("""
             MERGE (m:Manuscript {id: $mid})
             MERGE (s:Scene {id: $sid})
             SET s.created_at = timestamp()
             MERGE (m)-[:CONTAINS]->(s)
-        """, mid=mid, sid=scene_id)
+            RETURN s.created_at AS ts
+        """, mid=mid, sid=scene_id).single()["ts"]
 
         # 2. CHARACTERS (Specific Label)
-        # We use NarrativeEntity as a base label for everything to make matching easier
+        # We use NarrativeEntity as a base label for everything to make matching easier.
+        # The appearance range is kept on the node so reads never aggregate scenes.
         for char in entities.get("characters", []):
             tx.run("""
+                MATCH (s:Scene {id: $sid})
                 MERGE (c:NarrativeEntity {name: $name, manuscript_id: $mid})
+                ON CREATE SET c.slug = toLower(replace($name, ' ', '_'))
                 SET c:Character, 
+                    c.name_lower = toLower($name),
                     c.archetype = $archetype, 
                     c.emotion = $emotion,
-                    c.goal = $goal
-                MERGE (c)-[:APPEARS_IN]->(s:Scene {id: $sid})
+                    c.goal = $goal,
+                    c.first_appearance = CASE WHEN c.first_appearance IS NULL OR $ts < c.first_appearance
+                                              THEN $ts ELSE c.first_appearance END,
+                    c.last_appearance = CASE WHEN c.last_appearance IS NULL OR $ts > c.last_appearance
+                                             THEN $ts ELSE c.last_appearance END
+                MERGE (c)-[:APPEARS_IN]->(s)
             """, 
-            name=char['text'], mid=mid, sid=scene_id,
+            name=char['text'], mid=mid, sid=scene_id, ts=scene_ts,
             archetype=char.get('archetype', 'Unknown'),
             emotion=char.get('emotion', 'Neutral'),
             goal=char.get('goal', 'None'))
@@ -50,6 +148,7 @@ class GraphManager:
         for loc in entities.get("locations", []):
             tx.run("""
                 MERGE (l:NarrativeEntity {name: $name, manuscript_id: $mid})
+                ON CREATE SET l.slug = toLower(replace($name, ' ', '_'))
                 SET l:Location, 
                     l.atmosphere = $atmos,
                     l.type = $type
@@ -75,7 +174,9 @@ class GraphManager:
             # Dynamic Cypher injection for relationship type
             query = f"""
                 MERGE (a:NarrativeEntity {{name: $source, manuscript_id: $mid}})
+                ON CREATE SET a.slug = toLower(replace($source, ' ', '_'))
                 MERGE (b:NarrativeEntity {{name: $target, manuscript_id: $mid}})
+                ON CREATE SET b.slug = toLower(replace($target, ' ', '_'))
                 MERGE (a)-[r:{rel_type}]->(b)
                 SET r.context = $context, 
                     r.last_seen_in = $sid,
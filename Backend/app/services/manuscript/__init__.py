@@ -11,7 +11,7 @@ Provides a complete pipeline for:
 from .text_extractor import TextExtractor, extract_text_from_file
 from .document_chunker import DocumentChunker
 from .summarizer import BaseSummarizer, GroqSummarizer, get_summarizer
-from .manuscript_processor import ManuscriptProcessor, process_manuscript
+from .manuscript_processor import ManuscriptProcessor, get_manuscript_processor, process_manuscript
 
 __all__ = [
     "TextExtractor",
@@ -21,5 +21,6 @@ __all__ = [
     "GroqSummarizer",
     "get_summarizer",
     "ManuscriptProcessor",
+    "get_manuscript_processor",
     "process_manuscript",
 ]
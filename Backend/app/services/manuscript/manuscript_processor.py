@@ -10,7 +10,8 @@ Orchestrates the full manuscript processing pipeline:
 This is the single entry point for the API layer.
 """
 
-from typing import Dict, Any, Optional
+from typing import BinaryIO, Dict, Any, Optional, Union
+import asyncio
 import logging
 
 from .text_extractor import TextExtractor
@@ -21,6 +22,10 @@ from app.db.manuscript_repository import get_manuscript_repository
 logger = logging.getLogger(__name__)
 
 
+def _count_words(text: str) -> int:
+    return len(text.split())
+
+
 class ManuscriptProcessor:
     """
     Full pipeline orchestrator for manuscript processing.
@@ -62,7 +67,7 @@ class ManuscriptProcessor:
     
     async def process(
         self,
-        file_content: bytes,
+        file_content: Union[bytes, BinaryIO],
         file_type: str,
         title: str,
         file_name: Optional[str] = None,
@@ -71,7 +76,8 @@ class ManuscriptProcessor:
         Process a manuscript through the full pipeline.
         
         Args:
-            file_content: Raw file bytes
+            file_content: Raw file bytes, or a seekable binary file
+                (e.g. an upload's spooled temp file) to parse in place
             file_type: File extension (pdf, docx, txt)
             title: Title for the manuscript
             file_name: Optional original filename
@@ -87,8 +93,12 @@ class ManuscriptProcessor:
         
         # Step 1: Extract text
         logger.info("  Step 1: Extracting text...")
-        text = self.extractor.extract_from_bytes(file_content, file_type)
-        word_count = len(text.split())
+        # Parsing is CPU-bound and synchronous; keep it off the event loop
+        if isinstance(file_content, (bytes, bytearray)):
+            text = await asyncio.to_thread(self.extractor.extract_from_bytes, file_content, file_type)
+        else:
+            text = await asyncio.to_thread(self.extractor.extract_from_file, file_content, file_type)
+        word_count = await asyncio.to_thread(_count_words, text)
         
         logger.info(f"  Extracted {word_count} words")
         
@@ -115,7 +125,7 @@ class ManuscriptProcessor:
         
         # Step 4: Store in MongoDB
         logger.info("  Step 4: Storing in database...")
-        document = self.repository.create(
+        document = await self.repository.create(
             title=title,
             original_text=text,
             summary=summary,
@@ -146,7 +156,7 @@ class ManuscriptProcessor:
         """
         logger.info(f"📝 Processing text: {title}")
         
-        word_count = len(text.split())
+        word_count = await asyncio.to_thread(_count_words, text)
         
         if word_count == 0:
             raise ValueError("Text is empty")
@@ -161,7 +171,7 @@ class ManuscriptProcessor:
             summary = await self.summarizer.summarize_chunks(chunks, context=f"Title: {title}")
         
         # Store
-        document = self.repository.create(
+        document = await self.repository.create(
             title=title,
             original_text=text,
             summary=summary,
@@ -174,6 +184,18 @@ class ManuscriptProcessor:
         return document
 
 
+# Singleton instance; the processor holds no per-request state
+_default_processor: Optional[ManuscriptProcessor] = None
+
+
+def get_manuscript_processor() -> ManuscriptProcessor:
+    """Get or create the shared manuscript processor."""
+    global _default_processor
+    if _default_processor is None:
+        _default_processor = ManuscriptProcessor()
+    return _default_processor
+
+
 # Convenient function for simple usage
 async def process_manuscript(
     file_content: bytes,
@@ -193,8 +215,7 @@ async def process_manuscript(
     Returns:
         Manuscript document with summary
     """
-    processor = ManuscriptProcessor()
-    return await processor.process(
+    return await get_manuscript_processor().process(
         file_content=file_content,
         file_type=file_type,
         title=title,
@@ -13,14 +13,60 @@ Design Decisions:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+import asyncio
 import logging
 import os
-import httpx
+import time
+
+from app.config import settings
+from app.services.creative_assistant.utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
+class KeyPool:
+    """
+    Spreads requests round-robin over several API keys.
+    
+    Each key has its own token bucket refilled at requests_per_minute, so
+    concurrent calls use every key's rate limit instead of queuing on one.
+    When all buckets are empty, acquire() waits for the earliest refill.
+    """
+    
+    def __init__(self, keys: List[str], requests_per_minute: int):
+        self.keys = keys
+        self.capacity = float(max(requests_per_minute, 1))
+        self.refill_per_second = self.capacity / 60.0
+        self._tokens = [self.capacity] * len(keys)
+        self._updated = [time.monotonic()] * len(keys)
+        self._next = 0
+    
+    def _refill(self, idx: int, now: float):
+        elapsed = now - self._updated[idx]
+        self._tokens[idx] = min(self.capacity, self._tokens[idx] + elapsed * self.refill_per_second)
+        self._updated[idx] = now
+    
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[str]:
+        """Yield the next key that has budget left, waiting if none does."""
+        while True:
+            now = time.monotonic()
+            for step in range(len(self.keys)):
+                idx = (self._next + step) % len(self.keys)
+                self._refill(idx, now)
+                if self._tokens[idx] >= 1:
+                    self._tokens[idx] -= 1
+                    self._next = (idx + 1) % len(self.keys)
+                    yield self.keys[idx]
+                    return
+            
+            wait = min((1 - tokens) / self.refill_per_second for tokens in self._tokens)
+            logger.debug(f"⏳ All {len(self.keys)} API keys rate-limited, waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+
 class BaseSummarizer(ABC):
     """
     Abstract base class for LLM summarizers.
@@ -87,26 +133,27 @@ class GroqSummarizer(BaseSummarizer):
         Initialize Groq summarizer.
         
         Args:
-            api_key: Groq API key (defaults to env XAI_API_KEY)
+            api_key: Groq API key (defaults to every configured XAI_API_KEY*)
             model: Model to use (defaults to llama-3.3-70b-versatile)
             temperature: Sampling temperature (default 0.3)
         """
-        self.api_key = api_key or self._get_api_key()
+        keys = [api_key] if api_key else self._get_api_keys()
         self._model = model or os.getenv("GROK_MODEL", self.DEFAULT_MODEL)
         self.temperature = temperature
         
-        if not self.api_key:
+        if not keys:
             raise ValueError(
                 "No Groq API key found. Set XAI_API_KEY environment variable."
             )
+        
+        self.key_pool = KeyPool(keys, settings.max_requests_per_minute)
     
-    def _get_api_key(self) -> Optional[str]:
-        """Get API key from environment, trying multiple options."""
-        for key_name in ["XAI_API_KEY", "XAI_API_KEY_2", "XAI_API_KEY_3"]:
-            key = os.getenv(key_name)
-            if key:
-                return key
-        return None
+    def _get_api_keys(self) -> List[str]:
+        """Get all configured API keys so calls can be spread across them."""
+        return [
+            key for key in (settings.xai_api_key, settings.xai_api_key_2, settings.xai_api_key_3)
+            if key
+        ]
     
     @property
     def model_name(self) -> str:
@@ -114,11 +161,6 @@ class GroqSummarizer(BaseSummarizer):
     
     async def _call_api(self, messages: List[dict]) -> str:
         """Make API call to Groq."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        
         payload = {
             "model": self._model,
             "messages": messages,
@@ -126,16 +168,23 @@ class GroqSummarizer(BaseSummarizer):
             "max_tokens": 2000,
         }
         
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
+        async with self.key_pool.acquire() as api_key:
+            headers = {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            }
+            
+            # Shared pool: keeps the TLS connection to Groq warm across calls
+            response = await get_http_client().post(
                 self.API_URL,
                 headers=headers,
-                json=payload
+                json=payload,
+                timeout=120.0,
             )
-            response.raise_for_status()
-            data = response.json()
-            
-            return data["choices"][0]["message"]["content"]
+        response.raise_for_status()
+        data = response.json()
+        
+        return data["choices"][0]["message"]["content"]
     
     async def summarize(self, text: str, context: Optional[str] = None) -> str:
         """
@@ -192,15 +241,18 @@ Provide a well-structured summary that captures the essence of the content."""
         
         logger.info(f"📚 Summarizing {len(chunks)} chunks...")
         
-        # Step 1: Summarize each chunk
-        chunk_summaries = []
-        for i, chunk in enumerate(chunks):
-            logger.info(f"  Processing chunk {i+1}/{len(chunks)}...")
-            summary = await self.summarize(
+        # Step 1: Summarize each chunk (concurrently; the key pool spreads
+        # the calls over every configured key's rate limit)
+        summaries = await asyncio.gather(*(
+            self.summarize(
                 chunk,
                 context=f"{context or 'Document'} - Part {i+1} of {len(chunks)}"
             )
-            chunk_summaries.append(f"[Part {i+1}]\n{summary}")
+            for i, chunk in enumerate(chunks)
+        ))
+        chunk_summaries = [
+            f"[Part {i+1}]\n{summary}" for i, summary in enumerate(summaries)
+        ]
         
         # Step 2: Combine and summarize the summaries
         combined = "\n\n".join(chunk_summaries)
@@ -28,6 +28,8 @@ class TextExtractor:
         extractor = TextExtractor()
         text = extractor.extract_from_bytes(file_bytes, "pdf")
         # or
+        text = extractor.extract_from_file(upload.file, "pdf")
+        # or
         text = extractor.extract_from_path("/path/to/file.docx")
     """
     
@@ -45,6 +47,26 @@ class TextExtractor:
         Returns:
             Extracted and cleaned text
             
+        Raises:
+            ValueError: If file type is unsupported
+            Exception: If extraction fails
+        """
+        return self.extract_from_file(io.BytesIO(content), file_type)
+    
+    def extract_from_file(self, file_obj: BinaryIO, file_type: str) -> str:
+        """
+        Extract text from a seekable binary file object.
+        
+        Lets callers hand over an upload's spooled temp file directly, so
+        PDF/DOCX parsers read from disk instead of a full in-memory copy.
+        
+        Args:
+            file_obj: Binary file positioned at the start of the document
+            file_type: File extension without dot (pdf, docx, txt)
+            
+        Returns:
+            Extracted and cleaned text
+            
         Raises:
             ValueError: If file type is unsupported
             Exception: If extraction fails
@@ -59,11 +81,11 @@ class TextExtractor:
         
         try:
             if file_type == "pdf":
-                return self._extract_pdf(io.BytesIO(content))
+                return self._extract_pdf(file_obj)
             elif file_type == "docx":
-                return self._extract_docx(io.BytesIO(content))
+                return self._extract_docx(file_obj)
             elif file_type == "txt":
-                return self._extract_txt(content)
+                return self._extract_txt(file_obj.read())
             
         except Exception as e:
             logger.error(f"Text extraction failed for {file_type}: {e}")
@@ -87,9 +109,7 @@ class TextExtractor:
         file_type = path.suffix.lower().strip(".")
         
         with open(path, "rb") as f:
-            content = f.read()
-        
-        return self.extract_from_bytes(content, file_type)
+            return self.extract_from_file(f, file_type)
     
     def _extract_pdf(self, file_obj: BinaryIO) -> str:
         """
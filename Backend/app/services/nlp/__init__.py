@@ -3,5 +3,6 @@ NLP Extraction Service Package
 """
 
 from .entity_extractor import EntityExtractor, GraphState
+from .batcher import Microbatcher
 
-__all__ = ["EntityExtractor", "GraphState"]
+__all__ = ["EntityExtractor", "Microbatcher", "GraphState"]
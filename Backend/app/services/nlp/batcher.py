@@ -0,0 +1,140 @@
+"""
+Extraction Micro-batcher
+
+Coalesces concurrent /nlp/extract requests into shared LLM calls.
+
+Design Decisions:
+- Each request enqueues its text and awaits a future; one worker drains the
+  queue for up to max_wait seconds (or max_batch items) and answers the
+  whole batch with a single completion, amortizing prompt overhead.
+- Items are sorted by length and packed into sub-batches under a character
+  budget, so one long text doesn't inflate a batch of short ones and a
+  batch never exceeds the provider's request-size limit.
+- A lone item, or a batch whose reply can't be matched back to its inputs,
+  falls back to the regular per-text extraction so callers always get an
+  answer.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import logging
+
+from .entity_extractor import EntityExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class Microbatcher:
+    """
+    Usage:
+        batcher = Microbatcher(EntityExtractor())
+        entities = await batcher.submit(text, metadata, context)
+    """
+    
+    def __init__(
+        self,
+        extractor: EntityExtractor,
+        max_batch: int = 8,
+        max_wait: float = 0.005,
+        max_batch_chars: int = 12000,
+    ):
+        self.extractor = extractor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_batch_chars = max_batch_chars
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Strong references to in-flight _resolve tasks; the loop only holds weak ones
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, text: str, metadata: dict, context: Optional[list] = None) -> Dict[str, Any]:
+        """Extract entities for one text, sharing an LLM call with concurrent requests."""
+        if self._worker is None or self._worker.done():
+            if self._worker is not None and not self._worker.cancelled() and self._worker.exception():
+                logger.error(f"❌ Extraction batcher worker died: {self._worker.exception()}")
+            # A restarted worker keeps the old queue, so requests already queued are still served
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(({"text": text, "metadata": metadata, "context": context or []}, future))
+        return await future
+    
+    async def stop(self):
+        """Cancel the worker. Call this during application shutdown."""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            # Poll with get_nowait: cancelling a pending get() can drop an item
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, self.max_wait / 5))
+            
+            # Sub-batches run concurrently; the worker goes back to collecting
+            for group in self._pack(batch):
+                task = asyncio.create_task(self._resolve(group))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+    
+    def _pack(self, batch: List[tuple]) -> List[List[tuple]]:
+        """Sort by length and split into sub-batches under the character budget."""
+        groups: List[List[tuple]] = []
+        current: List[tuple] = []
+        size = 0
+        for entry in sorted(batch, key=lambda e: len(e[0]["text"])):
+            length = min(len(entry[0]["text"]), 6000)
+            if current and size + length > self.max_batch_chars:
+                groups.append(current)
+                current, size = [], 0
+            current.append(entry)
+            size += length
+        if current:
+            groups.append(current)
+        return groups
+    
+    async def _resolve(self, group: List[tuple]):
+        items = [item for item, _ in group]
+        try:
+            if len(items) > 1:
+                try:
+                    results = await self.extractor.extract_batch(items)
+                    logger.debug(f"📦 Extracted {len(items)} texts in one LLM call")
+                except Exception as e:
+                    logger.warning(f"⚠️ Batched extraction failed, falling back per text: {e}")
+                    results = None
+            else:
+                results = None
+            
+            if results is None:
+                results = await asyncio.gather(*(
+                    self.extractor.extract(item["text"], item["metadata"], item["context"])
+                    for item in items
+                ), return_exceptions=True)
+        except Exception as e:
+            results = [e] * len(items)
+        
+        for (_, future), result in zip(group, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -142,6 +142,72 @@ class EntityExtractor:
         builder.add_edge("extract", END)
         return builder.compile()
 
+    async def extract_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extract entities for several texts with ONE LLM call.
+        
+        Args:
+            items: [{"text": ..., "context": [...]}, ...]
+            
+        Returns:
+            One entities dict per item, in input order
+            
+        Raises:
+            ValueError: If the reply can't be parsed into one result per item
+        """
+        payload = [
+            {"id": i, "active_memory": item["context"], "text": item["text"][:6000]}
+            for i, item in enumerate(items)
+        ]
+        prompt = ChatPromptTemplate.from_template("""
+            Analyze EACH text below independently and extract its Narrative Graph.
+            
+            STRICT RULES:
+            1. Output JSON ONLY. No intro, no outro, no markdown.
+            2. Keys must be in "double quotes".
+            3. "source" and "target" in relationships must match "characters" names EXACTLY.
+            4. Return exactly one result per input, in the same order, with the same "id".
+            
+            JSON STRUCTURE:
+            {{
+                "results": [
+                    {{
+                        "id": 0,
+                        "characters": [
+                            {{ "text": "Name", "archetype": "Role", "goal": "Goal" }}
+                        ],
+                        "locations": [
+                            {{ "text": "Place Name", "type": "Setting" }}
+                        ],
+                        "relationships": [
+                            {{ "source": "Name", "target": "Name", "type": "VERB", "properties": {{ "context": "Reason" }} }}
+                        ]
+                    }}
+                ]
+            }}
+            
+            INPUTS:
+            {inputs}
+        """)
+        
+        response = await self.llm.ainvoke(prompt.format(inputs=json.dumps(payload)))
+        extracted = self._surgical_json_parser(response.content)
+        results = (extracted or {}).get("results")
+        if not isinstance(results, list) or len(results) != len(items):
+            raise ValueError("Batched extraction returned a mismatched result list.")
+        
+        by_id = {r.get("id"): r for r in results if isinstance(r, dict)}
+        if len(by_id) != len(items):
+            by_id = dict(enumerate(results))
+        return [
+            {
+                "characters": by_id[i].get("characters", []),
+                "locations": by_id[i].get("locations", []),
+                "relationships": by_id[i].get("relationships", []),
+            }
+            for i in range(len(items))
+        ]
+
     async def extract(self, text: str, metadata: dict, context: list = None):
         return (await self.workflow.ainvoke({
             "text": text, "metadata": metadata, 
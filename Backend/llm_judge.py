@@ -1,40 +1,226 @@
 import os
+import re
 import json
+import hashlib
+import unicodedata
+from collections import deque
+from functools import lru_cache
+import redis
 from groq import Groq
 from dotenv import load_dotenv
+from app.db.redis_client import get_redis
 
 # Load environment variables
 load_dotenv()
 
 # Initialize Groq Client
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+EXTRACTION_MODEL = "llama-3.3-70b-versatile"
 
-def extract_entities(text):
+# --- EXTRACTION CACHE ---
+# Only the first 4000 chars reach the model, so they are the cache key.
+EXTRACTION_CONTEXT_CHARS = 4000
+EXTRACTION_CACHE_TTL = 30 * 24 * 3600
+# Re-submissions this similar (char-3gram Jaccard) with no new proper-noun
+# candidates reuse the last entity list
+NEAR_DUPLICATE_THRESHOLD = 0.95
+_recent_extractions = deque(maxlen=32)
+
+# --- RULE PRE-PASS ---
+# Runs of capitalized words ("Anna", "Lord Varys") are proper-noun candidates.
+PROPER_NOUN_PATTERN = re.compile(r"\b[A-Z][a-z'\u2019]+(?:\s+[A-Z][a-z'\u2019]+)*\b")
+WORD_PATTERN = re.compile(r"[a-z'\u2019]+")
+
+# Capitalized words that are never a character name on their own
+NON_NAME_WORDS = frozenset({
+    "a", "an", "the", "and", "but", "or", "so", "yet", "for", "nor", "if", "then",
+    "when", "while", "as", "at", "in", "on", "of", "to", "from", "with", "by",
+    "i", "he", "she", "it", "we", "they", "you", "his", "her", "its", "our", "their",
+    "my", "your", "this", "that", "these", "those", "there", "here", "what", "who",
+    "why", "how", "where", "yes", "no", "not", "oh", "after", "before", "later",
+    "suddenly", "meanwhile", "still", "now", "once", "all",
+})
+
+
+def fast_casefold(name):
+    """
+    Normalize a character name for case-insensitive matching.
+    Pure-ASCII names (the common case) take the C-level lower() fast path;
+    anything else is NFKD-normalized and casefolded.
+    """
+    if name.isascii():
+        return name.lower()
+    return unicodedata.normalize("NFKD", name).casefold()
+
+
+def rule_extract_entities(text, known_names):
+    """
+    Resolve the names in text against the known character vocabulary.
+
+    Returns the matched names, or None if any proper-noun candidate is not
+    a known character; the caller should then fall back to the LLM.
+    """
+    known = {fast_casefold(name): name for name in known_names if name}
+    lowercase_words = set(WORD_PATTERN.findall(text))
+    found = {}
+
+    for match in PROPER_NOUN_PATTERN.finditer(text[:4000]):
+        words = match.group(0).split()
+        # Drop leading sentence starters ("Then Anna" -> "Anna")
+        while words and words[0].lower() in NON_NAME_WORDS:
+            words.pop(0)
+        if not words:
+            continue
+
+        candidate = fast_casefold(" ".join(words))
+        if candidate in known:
+            found.setdefault(candidate, known[candidate])
+        elif len(words) == 1 and candidate in lowercase_words:
+            # Also used as an ordinary word elsewhere, e.g. a sentence start
+            continue
+        else:
+            return None
+
+    return list(found.values())
+
+
+def extract_entities(text, known_names=None):
     """
     Step 1: Simple Extraction.
     We just want to know WHO is mentioned so we can look up their profile.
     The 'Deep Logic' function will decide if they are actually 'present'.
+
+    When known_names is given, a regex pre-pass runs first and the LLM is
+    skipped if every proper noun in the scene is already a known character.
+    """
+    if known_names:
+        names = rule_extract_entities(text, known_names)
+        if names is not None:
+            return names
+
+    snippet = text[:EXTRACTION_CONTEXT_CHARS]
+    try:
+        # Near-duplicates are checked first and never memoized under the new snippet
+        names = _find_near_duplicate(_shingles(snippet), _name_candidates(snippet))
+        if names is None:
+            names = _cached_llm_extract(snippet)
+        return list(names)
+    except Exception:
+        return []
+
+
+def _shingles(text):
+    text = " ".join(text.lower().split())
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _name_candidates(text):
+    """Proper-noun candidates in text, minus leading sentence starters."""
+    candidates = set()
+    for match in PROPER_NOUN_PATTERN.finditer(text):
+        words = match.group(0).split()
+        while words and words[0].lower() in NON_NAME_WORDS:
+            words.pop(0)
+        if words:
+            candidates.add(" ".join(words))
+    return frozenset(candidates)
+
+
+def _find_near_duplicate(shingles, candidates):
+    """
+    Reuse the names of a recently extracted, almost identical snippet.
+    Only matches whose proper-noun candidates cover this snippet's, so an
+    edit that introduces a new name always goes to the model.
     """
+    # Snapshot: extraction also runs from worker threads
+    for seen, seen_candidates, names in list(_recent_extractions):
+        if not candidates <= seen_candidates:
+            continue
+        union = len(seen | shingles)
+        if union and len(seen & shingles) / union >= NEAR_DUPLICATE_THRESHOLD:
+            return names
+    return None
+
+
+@lru_cache(maxsize=512)
+def _cached_llm_extract(snippet):
+    """
+    LLM extraction behind two exact cache tiers: this lru_cache and a
+    Redis entry keyed on the snippet hash. Results are also recorded for
+    the near-duplicate check in extract_entities (small edits in progress).
+    Failures raise, so they are never cached.
+    """
+    key = f"entities:{EXTRACTION_MODEL}:" + hashlib.sha256(snippet.encode()).hexdigest()
+    try:
+        cached = get_redis().get(key)
+    except redis.RedisError:
+        cached = None
+
+    if cached is not None:
+        names = tuple(json.loads(cached))
+    else:
+        names = tuple(_llm_extract(snippet))
+        try:
+            get_redis().setex(key, EXTRACTION_CACHE_TTL, json.dumps(names))
+        except redis.RedisError:
+            pass
+
+    _recent_extractions.append((_shingles(snippet), _name_candidates(snippet), names))
+    return names
+
+
+def _llm_extract(snippet):
     prompt = f"""
     Analyze the scene below and list EVERY proper name mentioned.
     
-    SCENE: "{text[:4000]}"
+    SCENE: "{snippet}"
     
     OUTPUT JSON:
     {{
         "characters": ["Name1", "Name2"]
     }}
     """
-    try:
-        completion = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="llama-3.3-70b-versatile",
-            response_format={"type": "json_object"},
-            temperature=0
-        )
-        return json.loads(completion.choices[0].message.content).get("characters", [])
-    except:
-        return []
+    completion = client.chat.completions.create(
+        messages=[{"role": "user", "content": prompt}],
+        model=EXTRACTION_MODEL,
+        response_format={"type": "json_object"},
+        temperature=0
+    )
+    return json.loads(completion.choices[0].message.content).get("characters", [])
+
+def evaluate_violation(violation_type, violation_msg, scene_text, db_context):
+    """
+    Judge whether a detected continuity violation is an intentional
+    narrative device. Returns the model's raw JSON reply; the caller
+    validates it against its Verdict schema and retries if malformed.
+    """
+    prompt = f"""
+    You are a Narrative Logic Engine judging a continuity violation.
+
+    VIOLATION TYPE: {violation_type}
+    VIOLATION: {violation_msg}
+    DATABASE CONTEXT: {db_context}
+
+    SCENE: "{scene_text[:2500]}"
+
+    Decide whether the scene explains the violation (flashback, dream,
+    memory, ghost, deliberate twist) or whether it is a plain mistake.
+
+    OUTPUT JSON:
+    {{
+        "verdict": "INTENTIONAL" | "UNINTENTIONAL",
+        "detailed_analysis": "Explain WHY, citing the scene context.",
+        "fix_suggestion": "If UNINTENTIONAL, suggest a fix. Otherwise leave empty.",
+        "confidence": 0.0 to 1.0
+    }}
+    """
+    completion = client.chat.completions.create(
+        messages=[{"role": "user", "content": prompt}],
+        model=EXTRACTION_MODEL,
+        response_format={"type": "json_object"},
+        temperature=0
+    )
+    return completion.choices[0].message.content
 
 def evaluate_logic_deeply(scene_text, char_profile):
     """
@@ -4,7 +4,11 @@ FastAPI main application entry point for NOLAN Backend.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 import os
 import json
 import difflib  # ADDED: For smart typo detection
@@ -16,7 +20,7 @@ from neo4j import GraphDatabase
 # Import your custom logic
 from app.config import settings
 # CHANGED: Imported the new Deep Logic function
-from llm_judge import evaluate_logic_deeply, extract_entities 
+from llm_judge import evaluate_logic_deeply, extract_entities, fast_casefold
 
 # --- NEW IMPORT FOR THE CRITIC ---
 # Ensure backend/core/orchestrator.py exists as per previous steps
@@ -124,21 +128,22 @@ class ContinuityValidator:
         alerts = []
         logger.info(f"--- Deep Logic Analysis Started for Chapter {data.chapter_id} ---")
         
-        # 1. Dynamic Extraction
-        extracted_chars = extract_entities(data.text_snippet)
-        logger.info(f"📝 Extracted Entities: {extracted_chars}")
-
-        # Fetch ALL character names from DB once for fuzzy matching (Optimization)
         with self.driver.session() as session:
-            all_db_chars = session.run("MATCH (c:Character) RETURN c.name as name").value()
+            # Fetch ALL character profiles from DB once, keyed by normalized name (Optimization)
+            profiles = session.run("""
+                MATCH (c:Character)
+                RETURN c.name as name, c.status as status, c.last_seen_chapter as last_seen
+                """).data()
+            all_db_chars = [p["name"] for p in profiles if p["name"]]
+            profiles_by_name = {fast_casefold(p["name"]): p for p in profiles if p["name"]}
+
+            # 1. Dynamic Extraction (the LLM is skipped if every name is already known)
+            extracted_chars = extract_entities(data.text_snippet, known_names=all_db_chars)
+            logger.info(f"📝 Extracted Entities: {extracted_chars}")
 
             for name in extracted_chars:
-                # 2. Fetch Full Character Profile (Check EVERYONE, not just Alive)
-                db_char = session.run("""
-                    MATCH (c:Character) 
-                    WHERE toLower(c.name) = toLower($name) 
-                    RETURN c.name as name, c.status as status, c.last_seen_chapter as last_seen
-                    """, name=name).single()
+                # 2. Full Character Profile (Check EVERYONE, not just Alive)
+                db_char = profiles_by_name.get(fast_casefold(name))
                 
                 # CASE A: Unknown Character (With Smart Typo Detection)
                 if not db_char:
@@ -184,10 +189,117 @@ class ContinuityValidator:
 
 # --- FASTAPI APP SETUP ---
 
+async def warm_llm_clients():
+    """
+    Issue one tiny extraction and summary so the first user request doesn't
+    pay DNS, TLS and provider cold-start. Failures are logged, never raised.
+    """
+    from app.api.nlp import entity_extractor
+    from app.services.manuscript import get_summarizer
+
+    results = await asyncio.gather(
+        entity_extractor.extract("warmup.", {"manuscript_id": "_", "scene_id": "_", "paragraph": 0}, []),
+        get_summarizer(provider="groq").summarize(text="warmup.", context=""),
+        return_exceptions=True,
+    )
+    for name, result in zip(("entity extractor", "summarizer"), results):
+        if isinstance(result, Exception):
+            logger.warning(f"⚠️ LLM warmup failed for {name}: {result}")
+        else:
+            logger.info(f"🔥 LLM warmup done for {name}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services on startup and release them on shutdown."""
+    from app.api import creative_assistant
+    from app.api.auth import get_user_db
+    from app.api.nlp import entity_batcher
+    from app.db.manuscript_repository import get_manuscript_repository
+    from app.db.mongodb import close_connection
+    from app.db.redis_client import close_async_connection
+    from app.services.knowledge_graph import driver_info, graph_db
+
+    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
+
+    # Sized explicitly: to_thread offloads (text extraction, word counts,
+    # sync DB calls) all share this pool
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 5))
+    )
+
+    # Independent, blocking initializers run concurrently so their
+    # connection handshakes overlap
+    validator, user_db, services, graph, _ = await asyncio.gather(
+        asyncio.to_thread(ContinuityValidator),
+        # Open the user DB pool now so the first login doesn't pay for it
+        get_user_db().ensure_indexes(),
+        creative_assistant.init_services(),
+        graph_db.start(),
+        get_manuscript_repository().ensure_indexes(),
+        return_exceptions=True,
+    )
+
+    if isinstance(validator, Exception):
+        logger.error(f"❌ Failed to initialize Continuity Validator: {validator}")
+    else:
+        app.state.validator = validator
+        logger.info("✅ Continuity Validator Engine Initialized")
+
+    if isinstance(user_db, Exception):
+        logger.error(f"❌ Failed to warm user DB: {user_db}")
+    else:
+        logger.info("✅ User DB connection pool ready")
+
+    if isinstance(services, Exception):
+        logger.error(f"❌ Failed to initialize Creative Assistant services: {services}")
+    else:
+        logger.info("✅ Creative Assistant services ready")
+
+    if isinstance(graph, Exception):
+        logger.error(f"❌ Failed to initialize knowledge graph: {graph}")
+    else:
+        logger.info(f"✅ Knowledge graph connected ({driver_info()})")
+
+    # Warm in the background so a slow or unreachable provider can't hold up startup
+    warmup = asyncio.create_task(warm_llm_clients())
+
+    yield
+
+    # Cleanup on shutdown
+    logger.info("Shutting down application")
+    warmup.cancel()
+    if hasattr(app.state, "validator"):
+        app.state.validator.close()
+        logger.info("🔒 Neo4j Connection Closed")
+    await creative_assistant.close_services()
+    await entity_batcher.stop()
+    await graph_db.close()
+    await close_async_connection()
+    close_connection()
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# Oversized bodies are refused before they are read or parsed
+from app.api.middleware import BodySizeLimitMiddleware
+from app.api.creative_assistant import MAX_UPLOAD_BYTES as ASSISTANT_UPLOAD_BYTES
+from app.api.manuscript import MAX_UPLOAD_BYTES as MANUSCRIPT_UPLOAD_BYTES
+
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.max_request_bytes,
+    # Multipart framing adds a little on top of the file itself
+    path_limits={
+        "/api/v1/manuscript/upload": MANUSCRIPT_UPLOAD_BYTES + 1024 * 1024,
+        "/api/v1/creative-assistant/upload-file": ASSISTANT_UPLOAD_BYTES + 1024 * 1024,
+    },
 )
 
 app.add_middleware(
@@ -198,28 +310,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup."""
-    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
-    
-    # Initialize Validator
-    try:
-        app.state.validator = ContinuityValidator()
-        logger.info("✅ Continuity Validator Engine Initialized")
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize Continuity Validator: {e}")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown."""
-    logger.info("Shutting down application")
-    if hasattr(app.state, "validator"):
-        app.state.validator.close()
-        logger.info("🔒 Neo4j Connection Closed")
-
-
 @app.get("/")
 async def root():
     return {"status": "running", "mode": "cloud"}
@@ -36,6 +36,7 @@ class GraphManager:
             tx.run("""
                 MERGE (c:NarrativeEntity {name: $name, manuscript_id: $mid})
                 SET c:Character, 
+                    c.name_lower = toLower($name),
                     c.archetype = $archetype, 
                     c.emotion = $emotion,
                     c.goal = $goal
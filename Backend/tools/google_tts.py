@@ -8,7 +8,7 @@ and the ability to match voice characteristics to character profiles.
 import asyncio
 import edge_tts
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import AsyncIterator, Optional, Dict, Any, List
 from datetime import datetime
 import json
 
@@ -145,6 +145,38 @@ class GoogleTTS:
         )
         await communicate.save(output_path)
     
+    async def stream_speech(
+        self,
+        text: str,
+        voice_profile: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream synthesized speech as MP3 chunks, as edge-tts produces them
+        
+        Args:
+            text: Text to synthesize
+            voice_profile: Character voice profile for voice selection
+            
+        Yields:
+            MP3 audio bytes
+        """
+        if voice_profile:
+            voice = self.select_voice_for_character(voice_profile)
+            params = self.get_speech_parameters(voice_profile)
+        else:
+            voice = self.VOICE_MAPPING['default']
+            params = {"rate": "+0%", "pitch": "+0Hz"}
+        
+        communicate = edge_tts.Communicate(
+            text=text,
+            voice=voice,
+            rate=params['rate'],
+            pitch=params['pitch']
+        )
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                yield chunk["data"]
+    
     def synthesize_speech(
         self,
         text: str,
@@ -73,8 +73,9 @@ export const SummaryCard = () => {
                 throw new Error('Failed to generate voice');
             }
 
-            const data = await response.json();
-            setAudioUrl(`http://localhost:8000${data.audio_url}`);
+            // The endpoint streams MP3 bytes directly
+            const audioBlob = await response.blob();
+            setAudioUrl(URL.createObjectURL(audioBlob));
         } catch (err) {
             console.error('Voice generation error:', err);
             setError('Failed to generate voice');
@@ -0,0 +1,33 @@
+"""
+Quick test script for the continuity validator
+Run after the validator (uvicorn api:app from Backend/) is running
+"""
+import requests
+import json
+
+BASE_URL = "http://localhost:8000"
+
+def test_validate():
+    print("\n--- Testing Validate ---")
+    # Named characters force the extraction -> graph lookup -> judge path
+    data = {
+        "chapter_id": 1,
+        "text_snippet": "Anna crossed the courtyard while Boris watched from the tower."
+    }
+    response = requests.post(f"{BASE_URL}/validate", json=data)
+    print(f"Status: {response.status_code}")
+    result = response.json()
+    print(json.dumps(result, indent=2))
+    return response.status_code == 200 and result.get("status") in ("valid", "violation")
+
+if __name__ == "__main__":
+    try:
+        if test_validate():
+            print("\n✅ Validation path working!")
+        else:
+            print("\n❌ Validation failed")
+
+    except requests.exceptions.ConnectionError:
+        print("❌ Could not connect to backend. Is it running on localhost:8000?")
+    except Exception as e:
+        print(f"❌ Error: {e}")